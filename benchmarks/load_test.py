@@ -0,0 +1,150 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.stub_server import StubServer, StubState  # noqa: E402
+
+
+def parse_args():
+    """Параметры нагрузочного теста."""
+    parser = argparse.ArgumentParser(
+        description='Нагрузочный тест бота на локальных заглушках API.'
+    )
+    parser.add_argument('--subscribers', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='задержка ответа yandex-API, с')
+    parser.add_argument('--telegram-latency', type=float, default=0.0,
+                        help='задержка ответа Bot API, с')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='доля ответов 500')
+    parser.add_argument('--change-rate', type=float, default=0.1,
+                        help='доля ответов с новыми статусами')
+    parser.add_argument('--homeworks', type=int, default=1,
+                        help='работ в ответе с новыми статусами')
+    return parser.parse_args()
+
+
+def configure_environment(server, args):
+    """Направляет бота на заглушки до импорта homework."""
+    os.environ['PRACTICUM_ENDPOINT'] = server.endpoint
+    os.environ['TELEGRAM_API_URL'] = server.telegram_url
+    os.environ['TELEGRAM_TOKEN'] = '123456:benchmark'
+    os.environ.setdefault('LOG_LEVEL', 'CRITICAL')
+    os.environ['MAX_CONCURRENT_POLLS'] = str(args.concurrency)
+
+
+def percentile(values, share):
+    """Перцентиль отсортированного списка."""
+    if not values:
+        return float('nan')
+    index = min(int(len(values) * share), len(values) - 1)
+    return values[index]
+
+
+async def watch_subscriptions(homework, bot, registry, concurrency, done):
+    """
+    Опрос реестра наблюдателями подписок, как в async_main.
+    Наблюдатели останавливаются, когда done() вернёт True.
+    """
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    watchers = [
+        asyncio.create_task(
+            homework.async_watch_subscription(bot, subscription, semaphore)
+        )
+        for subscription in registry.snapshot()
+    ]
+    while not done(time.perf_counter() - started):
+        await asyncio.sleep(0.05)
+    for watcher in watchers:
+        watcher.cancel()
+    await asyncio.gather(*watchers, return_exceptions=True)
+    return time.perf_counter() - started
+
+
+def run(args):
+    """Запускает заглушки, бота и печатает отчёт."""
+    with StubServer(StubState(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        change_rate=args.change_rate,
+        homeworks=args.homeworks,
+        telegram_latency=args.telegram_latency,
+    )) as server:
+        configure_environment(server, args)
+        import telegram
+        from telegram.utils.request import Request
+
+        import homework
+        from outbox import Outbox
+        from subscriptions import SubscriptionRegistry
+
+        logging.getLogger().setLevel(logging.CRITICAL)
+        homework.setup_http_session()
+        # Наблюдатели опрашивают подписки без пауз между циклами.
+        homework.RETRY_PERIOD = 0
+        homework.ADAPTIVE_POLLING = False
+        bot = telegram.Bot(
+            token=homework.TELEGRAM_TOKEN,
+            base_url=homework.TELEGRAM_API_URL,
+            request=Request(con_pool_size=args.concurrency),
+        )
+        homework.outbox = Outbox(
+            bot, workers=8, global_rate=10_000, chat_rate=10_000,
+            chat_burst=10,
+        ).start()
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        registry = SubscriptionRegistry()
+        for number in range(args.subscribers):
+            registry.add(f'token-{number:08d}', number + 1, timestamp=0)
+        asyncio.run(watch_subscriptions(
+            homework, bot, registry, args.concurrency,
+            lambda elapsed: server.state.polls >= args.subscribers
+        ))
+        memory = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+
+        polls_before = server.state.polls
+        elapsed = asyncio.run(watch_subscriptions(
+            homework, bot, registry, args.concurrency,
+            lambda elapsed: elapsed >= args.duration
+        ))
+        polls = server.state.polls - polls_before
+        homework.outbox.close(timeout=30)
+        latencies = server.state.latencies()
+
+    print(f'Подписчиков:             {args.subscribers}')
+    print(
+        f'Опросов на подписчика:   {polls / args.subscribers:.1f} '
+        f'за {elapsed:.2f} с'
+    )
+    print(f'Опросов в секунду:       {polls / elapsed:.1f}')
+    print(f'Ошибок API:              {server.state.errors}')
+    print(f'Сообщений в телеграм:    {server.state.messages}')
+    print(
+        'Задержка уведомления:    '
+        f'p50 {percentile(latencies, 0.5) * 1000:.1f} мс, '
+        f'p99 {percentile(latencies, 0.99) * 1000:.1f} мс '
+        f'({len(latencies)} шт.)'
+    )
+    print(
+        f'Память на подписчика:    {memory / args.subscribers:.0f} байт'
+    )
+
+
+if __name__ == '__main__':
+    run(parse_args())
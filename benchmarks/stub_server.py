@@ -0,0 +1,180 @@
+import json
+import random
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+PRACTICUM_PATH = '/api/user_api/homework_statuses/'
+STATUSES = ('reviewing', 'rejected', 'approved')
+
+
+class StubState:
+    """
+    Состояние заглушки: параметры нагрузки и собранная статистика.
+    served_at - когда по работе впервые отдан новый статус,
+    delivered_at - когда сообщение о ней пришло в телеграм.
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, change_rate=0.1,
+                 homeworks=1, telegram_latency=0.0):
+        """Параметры нагрузки заглушки и пустая статистика."""
+        self.latency = latency
+        self.error_rate = error_rate
+        self.change_rate = change_rate
+        self.homeworks = homeworks
+        self.telegram_latency = telegram_latency
+        self.lock = threading.Lock()
+        self.polls = 0
+        self.errors = 0
+        self.messages = 0
+        self.served_at = {}
+        self.delivered_at = {}
+        self._sequence = 0
+
+    def next_homeworks(self, token):
+        """Работы с новыми статусами для очередного ответа."""
+        if random.random() >= self.change_rate:
+            return []
+        now = time.time()
+        homeworks = []
+        with self.lock:
+            for _ in range(self.homeworks):
+                self._sequence += 1
+                name = f'hw-{self._sequence}'
+                self.served_at[name] = time.perf_counter()
+                homeworks.append({
+                    'id': self._sequence,
+                    'homework_name': name,
+                    'status': random.choice(STATUSES),
+                    'lesson_name': f'lesson of {token[:8]}',
+                    'reviewer_comment': 'Нагрузочный тест.',
+                    'date_updated': time.strftime(
+                        '%Y-%m-%dT%H:%M:%SZ', time.gmtime(now)
+                    ),
+                })
+        return homeworks
+
+    def latencies(self):
+        """Задержки от выдачи статуса до доставки сообщения, в секундах."""
+        with self.lock:
+            return sorted(
+                self.delivered_at[name] - served
+                for name, served in self.served_at.items()
+                if name in self.delivered_at
+            )
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов к заглушкам yandex-API и Bot API телеграма."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        """Заглушка не пишет журнал запросов."""
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        """Ответ заглушки yandex-API."""
+        state = self.server.state
+        url = urlsplit(self.path)
+        if url.path != PRACTICUM_PATH:
+            return self._reply(HTTPStatus.NOT_FOUND, {})
+        authorization = self.headers.get('Authorization', '')
+        if not authorization.startswith('OAuth '):
+            return self._reply(HTTPStatus.UNAUTHORIZED, {
+                'code': 'not_authenticated',
+                'message': 'Учетные данные не были предоставлены.',
+            })
+        if state.latency:
+            time.sleep(state.latency)
+        with state.lock:
+            state.polls += 1
+        if random.random() < state.error_rate:
+            with state.lock:
+                state.errors += 1
+            return self._reply(HTTPStatus.INTERNAL_SERVER_ERROR, {})
+        from_date = parse_qs(url.query).get('from_date', [''])[0]
+        if not from_date.isdigit():
+            return self._reply(HTTPStatus.BAD_REQUEST, {
+                'code': 'UnknownError',
+                'error': {'error': 'Wrong from_date format'},
+            })
+        self._reply(HTTPStatus.OK, {
+            'homeworks': state.next_homeworks(authorization[6:]),
+            'current_date': int(time.time()),
+        })
+
+    def do_POST(self):
+        """Ответ заглушки метода sendMessage."""
+        state = self.server.state
+        length = int(self.headers.get('Content-Length', 0))
+        data = json.loads(self.rfile.read(length) or b'{}')
+        if not self.path.endswith('/sendMessage'):
+            return self._reply(HTTPStatus.NOT_FOUND, {'ok': False})
+        if state.telegram_latency:
+            time.sleep(state.telegram_latency)
+        text = data.get('text', '')
+        now = time.perf_counter()
+        with state.lock:
+            state.messages += 1
+            for word in text.split('"'):
+                if word.startswith('hw-'):
+                    state.delivered_at.setdefault(word, now)
+        self._reply(HTTPStatus.OK, {'ok': True, 'result': {
+            'message_id': state.messages,
+            'date': int(time.time()),
+            'chat': {'id': int(data.get('chat_id', 0)), 'type': 'private'},
+            'text': text,
+        }})
+
+
+class StubServer:
+    """
+    Локальная заглушка ENDPOINT и Bot API телеграма в фоновом потоке.
+    Используется как контекстный менеджер.
+    """
+
+    def __init__(self, state=None, host='127.0.0.1', port=0):
+        """Сервер на host:port, порт 0 - любой свободный."""
+        self.state = state or StubState()
+        self._server = ThreadingHTTPServer((host, port), StubHandler)
+        self._server.daemon_threads = True
+        self._server.state = self.state
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    @property
+    def url(self):
+        """Базовый адрес заглушки."""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def endpoint(self):
+        """Адрес заглушки yandex-API."""
+        return f'{self.url}{PRACTICUM_PATH}'
+
+    @property
+    def telegram_url(self):
+        """base_url для telegram.Bot."""
+        return f'{self.url}/bot'
+
+    def __enter__(self):
+        """Запускает сервер в фоновом потоке."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Останавливает сервер и закрывает сокет."""
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,149 @@
+import argparse
+import os
+import sys
+import timeit
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from models import StatusResponse  # noqa: E402
+
+
+def parse_args():
+    """Параметры сравнения проверок ответа."""
+    parser = argparse.ArgumentParser(
+        description=(
+            'Сравнение прежней проверки ответа homework_statuses '
+            'с проверкой за один проход.'
+        )
+    )
+    parser.add_argument('--homeworks', type=int, default=10000,
+                        help='работ в ответе')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=20,
+                        help='проверок в одном замере')
+    return parser.parse_args()
+
+
+def make_response(count):
+    """Ответ API с count работами."""
+    return {
+        'current_date': 1700000000,
+        'homeworks': [
+            {
+                'id': index,
+                'status': 'approved',
+                'homework_name': f'username__hw_{index}.zip',
+                'reviewer_comment': 'Всё нравится',
+                'date_updated': '2020-02-13T14:40:57Z',
+                'lesson_name': 'Итоговый проект',
+            }
+            for index in range(count)
+        ],
+    }
+
+
+class PreviousHomework:
+    """Homework до проверки за один проход, без изменений."""
+
+    __slots__ = (
+        'id', 'homework_name', 'status', 'date_updated',
+        'reviewer_comment', 'lesson_name',
+    )
+
+    def __init__(self, **fields):
+        """Запись из полей ответа, лишние поля отбрасываются."""
+        for field in self.__slots__:
+            setattr(self, field, fields.get(field))
+
+    @classmethod
+    def from_dict(cls, data):
+        """Запись из словаря ответа API."""
+        if not isinstance(data, dict):
+            raise TypeError(
+                'Элементы \'homeworks\' должны быть словарями. '
+                f'Пришёл тип данных {type(data)}.'
+            )
+        return cls(**data)
+
+    def get(self, field, default=None):
+        """Значение поля или default, если поля нет."""
+        value = getattr(self, field, None)
+        return default if value is None else value
+
+    def __contains__(self, field):
+        """Есть ли поле в записи."""
+        return self.get(field) is not None
+
+
+def previous_check_response(data):
+    """Прежний StatusResponse.from_dict из check_response."""
+    if not isinstance(data, dict):
+        raise TypeError(
+            ('Данные должны быть приобразованы из json в словарь.'
+             f'Пришёл тип данных {type(data)}.')
+        )
+    if 'current_date' not in data:
+        raise KeyError(
+            'В словаре response должен быть ключ current_date.')
+    if 'homeworks' not in data:
+        raise KeyError(
+            'В словаре response должен быть ключ homeworks.')
+    if not isinstance(data['homeworks'], list):
+        raise TypeError(
+            ('Значением \'homeworks\' должен быть список.'
+             f'Пришёл тип данных {type(data["homeworks"])}.')
+        )
+    return [
+        PreviousHomework.from_dict(homework)
+        for homework in data['homeworks']
+    ]
+
+
+def parse_status_checks(homeworks):
+    """Проверки ключей, которые parse_status делает для каждой работы."""
+    for homework in homeworks:
+        if 'homework_name' not in homework:
+            raise KeyError('В homework нет ключа \'homework_name\'.')
+        if 'status' not in homework:
+            raise KeyError('В homework нет ключа \'status\'.')
+
+
+def previous_path(data):
+    """Прежний путь: check_response и проверки parse_status."""
+    parse_status_checks(previous_check_response(data))
+
+
+def current_path(data):
+    """Текущий путь: check_response и проверки parse_status."""
+    parse_status_checks(StatusResponse.from_dict(data).homeworks)
+
+
+def measure(func, data, repeat, number):
+    """Лучшее время одного прохода в миллисекундах."""
+    best = min(timeit.repeat(
+        lambda: func(data), repeat=repeat, number=number
+    ))
+    return best / number * 1000
+
+
+def run(args):
+    """Сравнивает пути на корректном ответе и на ответе с ошибками."""
+    data = make_response(args.homeworks)
+    previous = measure(previous_path, data, args.repeat, args.number)
+    current = measure(current_path, data, args.repeat, args.number)
+    print(f'Работ в ответе:          {args.homeworks}')
+    print(f'Прежний путь:            {previous:.3f} мс')
+    print(f'Текущий путь:            {current:.3f} мс')
+    print(f'Отношение:               {previous / current:.2f}x')
+    broken = make_response(args.homeworks)
+    for homework in broken['homeworks'][::100]:
+        del homework['status']
+    try:
+        current_path(broken)
+    except KeyError as error:
+        print(f'Проблем в ответе с ошибками: {len(error.defects)}')
+
+
+if __name__ == '__main__':
+    run(parse_args())
@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+
+from metrics import REGISTRY
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+CIRCUIT_REJECTED = REGISTRY.counter(
+    'homework_circuit_rejected_total',
+    'Вызовы, отклонённые разомкнутым предохранителем.',
+    labels=('upstream',),
+)
+
+
+class CircuitOpenError(ConnectionError):
+    """Вызов отклонён: предохранитель внешнего сервиса разомкнут."""
+
+
+class CircuitBreaker:
+    """
+    Предохранитель для вызовов внешнего сервиса.
+    После failure_threshold сбоев подряд размыкается: вызовы сразу
+    отклоняются, сервис не нагружается. Через probe_interval пропускает
+    один пробный вызов; удачный замыкает цепь, неудачный снова
+    размыкает её ещё на probe_interval.
+    """
+
+    def __init__(self, name, failure_threshold=5, probe_interval=60,
+                 clock=time.monotonic):
+        """Замкнутый предохранитель сервиса name."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """Текущее состояние: closed, open или half_open."""
+        with self._lock:
+            if (
+                self._state == OPEN
+                and self._clock() - self._opened_at >= self.probe_interval
+            ):
+                return HALF_OPEN
+            return self._state
+
+    def retry_after(self):
+        """Через сколько секунд можно будет сделать пробный вызов."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(
+                0.0, self._opened_at + self.probe_interval - self._clock()
+            )
+
+    def allow(self):
+        """
+        Можно ли сейчас обращаться к сервису.
+        В полуоткрытом состоянии разрешает только один пробный вызов.
+        """
+        with self._lock:
+            now = self._clock()
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if now - self._opened_at < self.probe_interval:
+                    return self._reject()
+                self._state = HALF_OPEN
+                self._probe_started = None
+            if (
+                self._probe_started is not None
+                and now - self._probe_started < self.probe_interval
+            ):
+                return self._reject()
+            self._probe_started = now
+            return True
+
+    def check(self):
+        """Как allow, но при отказе вызывает CircuitOpenError."""
+        if not self.allow():
+            raise CircuitOpenError(
+                f'Сервис {self.name} недоступен, запросы приостановлены.'
+            )
+
+    def record_success(self):
+        """Учитывает удачный вызов."""
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info('Сервис %s снова доступен.', self.name)
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_started = None
+
+    def record_failure(self):
+        """Учитывает сбой вызова."""
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state == HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                if self._state == CLOSED:
+                    logger.warning(
+                        'Сервис %s: %s сбоев подряд, запросы '
+                        'приостановлены на %s с.',
+                        self.name, self._failures, self.probe_interval
+                    )
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probe_started = None
+
+    def _reject(self):
+        CIRCUIT_REJECTED.inc(upstream=self.name)
+        return False
@@ -0,0 +1,95 @@
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+HELP = (
+    'Команды:\n'
+    '/status - последние известные статусы работ\n'
+    '/subscribe <токен Практикума> - подписать чат на статусы\n'
+    '/pause - приостановить или возобновить уведомления'
+)
+
+
+class CommandHandler:
+    """
+    Обработчик команд из чатов телеграма.
+    Работает с тем же реестром подписок и индексом статусов, что и
+    цикл опроса: /status отвечает из памяти и хранилища состояния,
+    без запроса к yandex-API.
+    """
+
+    def __init__(self, registry, status_diff, verdicts,
+                 on_subscribe=None, on_pause=None):
+        """Обработчик поверх реестра подписок и индекса статусов."""
+        self.registry = registry
+        self.status_diff = status_diff
+        self.verdicts = verdicts
+        self.on_subscribe = on_subscribe
+        self.on_pause = on_pause
+        self._commands = {
+            '/start': self.help,
+            '/help': self.help,
+            '/status': self.status,
+            '/subscribe': self.subscribe,
+            '/pause': self.pause,
+        }
+
+    def handle(self, chat_id, text):
+        """Ответ на сообщение чата или None, если это не команда."""
+        if not text or not text.startswith('/'):
+            return None
+        command, *args = text.split()
+        command = command.split('@', 1)[0].lower()
+        handler = self._commands.get(command)
+        if handler is None:
+            return f'Неизвестная команда {command}.\n\n{HELP}'
+        logger.debug('Команда %s из чата %s', command, chat_id)
+        return handler(str(chat_id), args)
+
+    def help(self, chat_id, args):
+        """Список команд."""
+        return HELP
+
+    def status(self, chat_id, args):
+        """Последние известные статусы работ подписок чата."""
+        subscriptions = self.registry.for_chat(chat_id)
+        if not subscriptions:
+            return 'Чат не подписан. Подпишитесь командой /subscribe.'
+        lines = []
+        for subscription in subscriptions:
+            known = self.status_diff.statuses(subscription.key)
+            for homework_id, (status, _, name) in sorted(known.items()):
+                verdict = self.verdicts.get(status, status)
+                lines.append(f'"{name or homework_id}": {verdict}')
+        if not lines:
+            return 'Новых статусов по работам пока не было.'
+        return '\n'.join(lines)
+
+    def subscribe(self, chat_id, args):
+        """Подписывает чат на статусы работ по токену Практикума."""
+        if len(args) != 1:
+            return 'Использование: /subscribe <токен Практикума>'
+        token = args[0]
+        if self.registry.get(token, chat_id) is not None:
+            return 'Чат уже подписан на этот токен.'
+        subscription = self.registry.add(token, chat_id)
+        if self.on_subscribe is not None:
+            self.on_subscribe(subscription)
+        return 'Чат подписан, о новых статусах работ придёт сообщение.'
+
+    def pause(self, chat_id, args):
+        """Приостанавливает или возобновляет опрос подписок чата."""
+        subscriptions = self.registry.for_chat(chat_id)
+        if not subscriptions:
+            return 'Чат не подписан. Подпишитесь командой /subscribe.'
+        paused = not all(
+            subscription.paused for subscription in subscriptions
+        )
+        for subscription in subscriptions:
+            subscription.paused = paused
+            if self.on_pause is not None:
+                self.on_pause(subscription)
+        if paused:
+            return 'Уведомления приостановлены. Снова /pause - возобновить.'
+        return 'Уведомления возобновлены.'
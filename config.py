@@ -9,6 +9,8 @@ load_dotenv()
 
 LOGGING_FORMAT = '%(asctime)s - %(levelname)s - %(funcName)s - %(lineno)d - %(message)s'
 
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG').upper()
+
 PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
 
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
@@ -17,7 +19,12 @@ TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 RETRY_PERIOD = 600
 
-ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+ENDPOINT = os.getenv(
+    'PRACTICUM_ENDPOINT',
+    'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+)
+
+TELEGRAM_API_URL = os.getenv('TELEGRAM_API_URL')
 
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
@@ -26,3 +33,112 @@ HOMEWORK_VERDICTS = {
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
+
+SUBSCRIPTIONS_FILE = os.getenv('SUBSCRIPTIONS_FILE')
+
+SUBSCRIPTIONS_RELOAD_INTERVAL = float(
+    os.getenv('SUBSCRIPTIONS_RELOAD_INTERVAL', 30)
+)
+
+MAX_CONCURRENT_POLLS = int(os.getenv('MAX_CONCURRENT_POLLS', 32))
+
+HTTP_KEEP_ALIVE = os.getenv('HTTP_KEEP_ALIVE', 'true').lower() == 'true'
+
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', MAX_CONCURRENT_POLLS))
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 5))
+
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 30))
+
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 1024))
+
+ADAPTIVE_POLLING = os.getenv('ADAPTIVE_POLLING', 'false').lower() == 'true'
+
+FAST_RETRY_PERIOD = int(os.getenv('FAST_RETRY_PERIOD', 60))
+
+MAX_RETRY_PERIOD = int(os.getenv('MAX_RETRY_PERIOD', 3600))
+
+RETRY_BACKOFF_FACTOR = float(os.getenv('RETRY_BACKOFF_FACTOR', 2))
+
+RETRY_JITTER = float(os.getenv('RETRY_JITTER', 0.1))
+
+COMBINE_NOTIFICATIONS = (
+    os.getenv('COMBINE_NOTIFICATIONS', 'false').lower() == 'true'
+)
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+STATE_BACKEND = os.getenv('STATE_BACKEND', 'sqlite')
+
+STATE_PATH = os.getenv(
+    'STATE_PATH',
+    'homework_bot.json' if STATE_BACKEND == 'json' else 'homework_bot.sqlite3'
+)
+
+STATE_FLUSH_INTERVAL = float(os.getenv('STATE_FLUSH_INTERVAL', 5))
+
+OUTBOX_WORKERS = int(os.getenv('OUTBOX_WORKERS', 4))
+
+OUTBOX_DRAIN_TIMEOUT = float(os.getenv('OUTBOX_DRAIN_TIMEOUT', 10))
+
+TELEGRAM_GLOBAL_RATE = float(os.getenv('TELEGRAM_GLOBAL_RATE', 30))
+
+TELEGRAM_CHAT_RATE = float(os.getenv('TELEGRAM_CHAT_RATE', 1))
+
+TELEGRAM_CHAT_BURST = int(os.getenv('TELEGRAM_CHAT_BURST', 1))
+
+TEMPLATE_LOCALE = os.getenv('TEMPLATE_LOCALE', 'ru')
+
+TEMPLATES_FILE = os.getenv('TEMPLATES_FILE')
+
+METRICS_PORT = int(os.getenv('METRICS_PORT', 0))
+
+STREAMING_RESPONSES = (
+    os.getenv('STREAMING_RESPONSES', 'false').lower() == 'true'
+)
+
+STREAM_CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', 64 * 1024))
+
+PRACTICUM_FAILURE_THRESHOLD = int(os.getenv('PRACTICUM_FAILURE_THRESHOLD', 5))
+
+PRACTICUM_PROBE_INTERVAL = float(os.getenv('PRACTICUM_PROBE_INTERVAL', 60))
+
+TELEGRAM_FAILURE_THRESHOLD = int(os.getenv('TELEGRAM_FAILURE_THRESHOLD', 5))
+
+TELEGRAM_PROBE_INTERVAL = float(os.getenv('TELEGRAM_PROBE_INTERVAL', 30))
+
+SHUTDOWN_TIMEOUT = float(os.getenv('SHUTDOWN_TIMEOUT', 20))
+
+TELEGRAM_COMMANDS = os.getenv('TELEGRAM_COMMANDS', 'false').lower() == 'true'
+
+COMMANDS_POLL_TIMEOUT = int(os.getenv('COMMANDS_POLL_TIMEOUT', 30))
+
+SHARD_COUNT = int(os.getenv('SHARD_COUNT', 1))
+
+SHARD_INDEX = os.getenv('SHARD_INDEX')
+
+SHARD_REPLICAS = 128
+
+DYNO = os.getenv('DYNO')
+
+SHARD_FROM_DYNO = os.getenv('SHARD_FROM_DYNO', 'false').lower() == 'true'
+
+API_RETRY_ATTEMPTS = int(os.getenv('API_RETRY_ATTEMPTS', 3))
+
+API_RETRY_BASE_DELAY = float(os.getenv('API_RETRY_BASE_DELAY', 0.25))
+
+API_RETRY_MAX_DELAY = float(os.getenv('API_RETRY_MAX_DELAY', 2))
+
+API_RETRY_BUDGET = float(os.getenv('API_RETRY_BUDGET', 10))
+
+ERROR_NOTIFY_INTERVAL = float(os.getenv('ERROR_NOTIFY_INTERVAL', 3600))
+
+ERROR_SUMMARY_INTERVAL = float(os.getenv('ERROR_SUMMARY_INTERVAL', 1800))
+
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()
+
+PROFILING = os.getenv('PROFILING', 'false').lower() == 'true'
+
+PROFILE_BUFFER_SIZE = int(os.getenv('PROFILE_BUFFER_SIZE', 10000))
+
+PROFILE_DUMP_PATH = os.getenv('PROFILE_DUMP_PATH', 'homework_bot.folded')
@@ -0,0 +1,110 @@
+import re
+import time
+
+
+ERROR_MESSAGE = 'Сбой в работе программы: {error}'
+SUMMARY_MESSAGE = (
+    'Сбой продолжается уже {minutes} мин, ошибок: {failures}. '
+    'Последняя: {error}'
+)
+RECOVERY_MESSAGE = (
+    'Работа восстановлена после {minutes} мин сбоев, ошибок: {failures}.'
+)
+
+
+def fingerprint(error):
+    """
+    Отпечаток ошибки.
+    Тип, тип причины и первая строка текста без чисел: одна и та же
+    неполадка с разными числами в тексте (from_date, время) даёт
+    один отпечаток.
+    """
+    cause = error.__cause__ or error.__context__
+    first_line = str(error).split('\n', 1)[0]
+    return '{}:{}:{}'.format(
+        type(error).__name__,
+        type(cause).__name__ if cause is not None else '',
+        re.sub(r'\d+', '#', first_line),
+    )
+
+
+class _Outage:
+    """Текущая полоса сбоев одной подписки."""
+
+    __slots__ = (
+        'started', 'failures', 'notified', 'last_summary', 'restored',
+    )
+
+    def __init__(self, started, restored=None):
+        self.started = started
+        self.failures = 0
+        self.notified = {}
+        self.last_summary = started
+        self.restored = restored
+
+
+class ErrorAggregator:
+    """
+    Уведомления об ошибках без спама.
+    Ошибки группируются по отпечатку: об ошибке с новым отпечатком
+    сообщается сразу, о повторе - не чаще notify_interval. Пока сбои
+    продолжаются, раз в summary_interval приходит сводка, а после
+    первого удачного опроса - сообщение о восстановлении.
+    """
+
+    def __init__(self, notify_interval=3600, summary_interval=1800,
+                 clock=time.monotonic):
+        """Агрегатор без известных сбоев."""
+        self.notify_interval = notify_interval
+        self.summary_interval = summary_interval
+        self._clock = clock
+        self._outages = {}
+
+    def restore(self, key, message):
+        """
+        Помнит уведомление, отправленное до перезапуска.
+        Такая же ошибка после перезапуска не отправляется повторно.
+        """
+        if message:
+            outage = _Outage(self._clock(), restored=message)
+            outage.failures = 1
+            self._outages[key] = outage
+
+    def record_error(self, key, error):
+        """Учитывает ошибку. Возвращает текст уведомления или None."""
+        now = self._clock()
+        outage = self._outages.get(key)
+        if outage is None:
+            outage = self._outages[key] = _Outage(now)
+        outage.failures += 1
+        error_fingerprint = fingerprint(error)
+        message = ERROR_MESSAGE.format(error=error)
+        if outage.restored == message:
+            outage.notified[error_fingerprint] = now
+        outage.restored = None
+        notified = outage.notified.get(error_fingerprint)
+        if notified is None or now - notified >= self.notify_interval:
+            outage.notified[error_fingerprint] = now
+            outage.last_summary = now
+            return message
+        if now - outage.last_summary >= self.summary_interval:
+            outage.last_summary = now
+            return SUMMARY_MESSAGE.format(
+                minutes=int((now - outage.started) // 60),
+                failures=outage.failures,
+                error=error,
+            )
+        return None
+
+    def record_success(self, key):
+        """
+        Учитывает удачный опрос.
+        Возвращает сообщение о восстановлении, если о сбое сообщали.
+        """
+        outage = self._outages.pop(key, None)
+        if outage is None or not (outage.notified or outage.restored):
+            return None
+        return RECOVERY_MESSAGE.format(
+            minutes=int((self._clock() - outage.started) // 60),
+            failures=outage.failures,
+        )
@@ -1,16 +1,61 @@
+import os
 import sys
 import time
+import asyncio
+import functools
 import logging
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 
 import requests
 import telegram
+from telegram.utils.request import Request
 
 from config import (
     ENDPOINT, HEADERS, HOMEWORK_VERDICTS,
     PRACTICUM_TOKEN, RETRY_PERIOD, TELEGRAM_CHAT_ID,
-    TELEGRAM_TOKEN, LOGGING_FORMAT,
+    TELEGRAM_TOKEN, LOGGING_FORMAT, MAX_CONCURRENT_POLLS,
+    SUBSCRIPTIONS_FILE, HTTP_KEEP_ALIVE, HTTP_POOL_SIZE,
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, RESPONSE_CACHE_SIZE,
+    ADAPTIVE_POLLING, FAST_RETRY_PERIOD, MAX_RETRY_PERIOD,
+    RETRY_BACKOFF_FACTOR, RETRY_JITTER, COMBINE_NOTIFICATIONS,
+    TELEGRAM_MESSAGE_LIMIT, STATE_BACKEND, STATE_PATH, STATE_FLUSH_INTERVAL,
+    OUTBOX_WORKERS, OUTBOX_DRAIN_TIMEOUT, TELEGRAM_GLOBAL_RATE,
+    TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST, TEMPLATE_LOCALE, TEMPLATES_FILE,
+    LOG_LEVEL, TELEGRAM_API_URL, METRICS_PORT, STREAMING_RESPONSES,
+    STREAM_CHUNK_SIZE, PRACTICUM_FAILURE_THRESHOLD, PRACTICUM_PROBE_INTERVAL,
+    TELEGRAM_FAILURE_THRESHOLD, TELEGRAM_PROBE_INTERVAL, SHUTDOWN_TIMEOUT,
+    TELEGRAM_COMMANDS, COMMANDS_POLL_TIMEOUT, SHARD_COUNT, SHARD_INDEX,
+    SHARD_REPLICAS, DYNO, API_RETRY_ATTEMPTS, API_RETRY_BASE_DELAY,
+    API_RETRY_MAX_DELAY, API_RETRY_BUDGET, ERROR_NOTIFY_INTERVAL,
+    ERROR_SUMMARY_INTERVAL, LOG_FORMAT, PROFILING, PROFILE_BUFFER_SIZE,
+    PROFILE_DUMP_PATH, SUBSCRIPTIONS_RELOAD_INTERVAL, SHARD_FROM_DYNO,
 )
+import http_client
+from circuit_breaker import CircuitBreaker
+from commands import CommandHandler
+from error_aggregator import ErrorAggregator
+from lifecycle import Lifecycle, ShutdownRequested
+from metrics import REGISTRY, start_metrics_server
+from models import StatusResponse
+from outbox import (
+    TELEGRAM_SEND_FAILURES, TELEGRAM_SEND_SECONDS, Outbox,
+    is_telegram_outage, join_messages,
+)
+from polling import AdaptiveSchedule, FixedSchedule
+from profiling import Profiler
+from response_cache import ResponseCache
+from retry import RetryPolicy
+from sharding import HashRing, dyno_shard_index
+from singleflight import SingleFlight
+from status_diff import StatusDiff, homework_key
+from storage import StateStore, open_state_store
+from streaming import StreamingStatusParser, iter_homeworks
+from structured_logging import JsonFormatter, start_queue_logging
+from subscriptions import SubscriptionRegistry, subscription_key, token_hash
+from templates import MessageTemplates
 
 
 handler = logging.StreamHandler(
@@ -22,9 +67,94 @@ formatter = logging.Formatter(
 handler.setFormatter(formatter)
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+logger.setLevel(LOG_LEVEL)
 logger.addHandler(handler)
 
+profiler = Profiler(enabled=PROFILING, capacity=PROFILE_BUFFER_SIZE)
+
+LIBRARY_LOGGERS = ('telegram', 'urllib3')
+
+HTTP_REQUEST_LOG_FORMAT = '%s\nАдрес: %s\nПараметры: %s'
+
+COMMANDS_ERROR_DELAY = 5
+
+API_REQUEST_SECONDS = REGISTRY.histogram(
+    'homework_api_request_seconds',
+    'Длительность запросов к yandex-API.',
+    labels=('status',),
+)
+CHECK_RESPONSE_FAILURES = REGISTRY.counter(
+    'homework_check_response_failures_total',
+    'Ответы yandex-API, не прошедшие проверку check_response.',
+    labels=('error',),
+)
+PARSE_STATUS_TOTAL = REGISTRY.counter(
+    'homework_parse_status_total',
+    'Сообщения, подготовленные parse_status, по статусам.',
+    labels=('status',),
+)
+PARSE_STATUS_FAILURES = REGISTRY.counter(
+    'homework_parse_status_failures_total',
+    'Ошибки parse_status.',
+    labels=('error',),
+)
+CYCLE_SECONDS = REGISTRY.histogram(
+    'homework_cycle_seconds',
+    'Длительность одного цикла опроса.',
+    labels=('loop',),
+)
+
+response_cache = ResponseCache(maxsize=RESPONSE_CACHE_SIZE)
+
+state_store = StateStore()
+
+status_diff = StatusDiff(state_store)
+
+message_templates = MessageTemplates(default_locale=TEMPLATE_LOCALE)
+message_templates.add_locale(TEMPLATE_LOCALE, HOMEWORK_VERDICTS)
+if TEMPLATES_FILE:
+    message_templates.load(TEMPLATES_FILE)
+
+outbox = None
+
+log_listener = None
+
+subscription_watchers = set()
+
+subscription_saves = set()
+
+subscriptions_file_lock = threading.Lock()
+
+lifecycle = Lifecycle(deadline=SHUTDOWN_TIMEOUT)
+
+error_aggregator = ErrorAggregator(
+    notify_interval=ERROR_NOTIFY_INTERVAL,
+    summary_interval=ERROR_SUMMARY_INTERVAL,
+)
+
+hash_ring = HashRing(SHARD_COUNT, replicas=SHARD_REPLICAS)
+
+status_requests = SingleFlight('homework_statuses')
+
+api_retry_policy = RetryPolicy(
+    attempts=API_RETRY_ATTEMPTS,
+    base_delay=API_RETRY_BASE_DELAY,
+    max_delay=API_RETRY_MAX_DELAY,
+    jitter=RETRY_JITTER,
+    budget=API_RETRY_BUDGET,
+)
+
+practicum_breaker = CircuitBreaker(
+    'yandex-API',
+    failure_threshold=PRACTICUM_FAILURE_THRESHOLD,
+    probe_interval=PRACTICUM_PROBE_INTERVAL,
+)
+telegram_breaker = CircuitBreaker(
+    'telegram',
+    failure_threshold=TELEGRAM_FAILURE_THRESHOLD,
+    probe_interval=TELEGRAM_PROBE_INTERVAL,
+)
+
 
 def check_tokens():
     """
@@ -53,30 +183,62 @@ def check_tokens():
 
 def send_message(bot, message):
     """Функция для отправки сообщения в телеграм."""
-    logger.debug(
-        msg=(
-            f'Начало отправки сообщения "{message}" '
-            f'в чат телеграма {TELEGRAM_CHAT_ID}'
+    send_message_to_chat(
+        bot=bot,
+        chat_id=TELEGRAM_CHAT_ID,
+        message=message
+    )
+
+
+@profiler.stage('send_message')
+def send_message_to_chat(bot, chat_id, message):
+    """
+    Отправка сообщения в указанный чат телеграма.
+    Пока предохранитель телеграма разомкнут, сообщение не отправляется.
+    """
+    if not telegram_breaker.allow():
+        logger.warning(
+            'Телеграм недоступен, сообщение "%s" в чат %s не отправлено.',
+            message, chat_id
         )
+        return
+    logger.debug(
+        'Начало отправки сообщения "%s" в чат телеграма %s',
+        message, chat_id, extra={'chat_id': chat_id}
     )
+    started = time.perf_counter()
     try:
         bot.send_message(
-            chat_id=TELEGRAM_CHAT_ID,
+            chat_id=chat_id,
             text=message,
         )
+        telegram_breaker.record_success()
+        TELEGRAM_SEND_SECONDS.observe(
+            time.perf_counter() - started, outcome='ok'
+        )
         logger.debug(
-            msg=(
-                f'Сообщение "{message}" '
-                f'успешно отправлено в чат телеграма {TELEGRAM_CHAT_ID}'
-            )
+            'Сообщение "%s" успешно отправлено в чат телеграма %s',
+            message, chat_id, extra={
+                'chat_id': chat_id,
+                'latency': round(time.perf_counter() - started, 4),
+            }
         )
     except telegram.TelegramError as err:
+        if is_telegram_outage(err):
+            telegram_breaker.record_failure()
+        else:
+            telegram_breaker.record_success()
+        TELEGRAM_SEND_SECONDS.observe(
+            time.perf_counter() - started, outcome='error'
+        )
+        TELEGRAM_SEND_FAILURES.inc(error=type(err).__name__)
         logger.error(
             msg=(
                 f'Ошибка при отправке сообщения "{message}"'
                 'о состоянии проекта, в чат телеграма'
-                f'{TELEGRAM_CHAT_ID}: {err}'
-            )
+                f'{chat_id}: {err}'
+            ),
+            extra={'chat_id': chat_id}
         )
 
 
@@ -85,43 +247,130 @@ def output_logging_for_http_request(main_msg, params):
     Функция выводит сообщения для логирования.
     В функции get_api_answer.
     """
-    return (
-        f'{main_msg}\n'
-        f'Адрес: {ENDPOINT}\n'
-        f'Параметры: {params}'
-    )
+    return HTTP_REQUEST_LOG_FORMAT % (main_msg, ENDPOINT, params)
+
+
+def record_practicum_status(status_code):
+    """
+    Учитывает ответ yandex-API в предохранителе.
+    Сбоем сервиса считаются только 5xx и 429.
+    """
+    if (
+        status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+        or status_code == HTTPStatus.TOO_MANY_REQUESTS
+    ):
+        practicum_breaker.record_failure()
+    else:
+        practicum_breaker.record_success()
 
 
+def request_log_fields(headers, status_code=None, latency=None):
+    """
+    Поля запроса к yandex-API для структурированного лога.
+    Вместо токена в лог попадает его хэш.
+    """
+    token = headers.get('Authorization', '').rsplit(' ', 1)[-1]
+    return {
+        'token_hash': token_hash(token),
+        'endpoint': ENDPOINT,
+        'status_code': int(status_code) if status_code else None,
+        'latency': round(latency, 4) if latency is not None else None,
+    }
+
+
+@profiler.stage('get_api_answer')
 def get_api_answer(timestamp):
     """
     Функция делает запрос к yandex-API.
     Если запрос успешный - возвращает тело ответа.
     Иначе вызываеи TypeError.
     """
+    return fetch_homework_statuses(
+        timestamp=timestamp,
+        headers=HEADERS
+    )
+
+
+def fetch_homework_statuses(timestamp, headers):
+    """
+    Запрос к yandex-API с заголовками конкретного токена.
+    Используется и для одиночного бота, и для реестра подписок.
+    """
+    return request_homework_statuses(
+        timestamp=timestamp,
+        headers=headers
+    )
+
+
+def request_homework_statuses(timestamp, headers):
+    """
+    Условный запрос к yandex-API, возвращает тело ответа.
+    Одновременные запросы с тем же токеном и from_date, например
+    из разных чатов одного токена, склеиваются в один запрос.
+    Кэш общий для всех подписок токена и только избавляет от повторного
+    разбора json: что из ответа ещё не отправлено в чат, решает
+    status_diff, поэтому ответ из кэша всё равно проверяется.
+    """
+    return status_requests.do(
+        (headers['Authorization'], timestamp),
+        perform_status_request, timestamp, headers
+    )
+
+
+def perform_status_request(timestamp, headers):
+    """
+    Условный запрос к yandex-API без склейки одинаковых запросов.
+    Временные сбои повторяются по api_retry_policy.
+    """
     params = {
         'from_date': timestamp,
     }
+    practicum_breaker.check()
+    cache_key = headers['Authorization']
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        headers = {**headers, **cached.validators()}
     try:
         logger.debug(
-            msg=output_logging_for_http_request(
-                main_msg='Начало GET запроса',
-                params=params
+            HTTP_REQUEST_LOG_FORMAT,
+            'Начало GET запроса', ENDPOINT, params,
+            extra=request_log_fields(headers)
+        )
+        started = time.perf_counter()
+        with profiler.span('http_request'):
+            response = api_retry_policy.get(
+                http_client.http_get,
+                ENDPOINT,
+                headers=headers,
+                params=params,
+                timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
             )
+        latency = time.perf_counter() - started
+        API_REQUEST_SECONDS.observe(
+            latency, status=int(response.status_code)
         )
-        response = requests.get(
-            ENDPOINT,
-            headers=HEADERS,
-            params=params
+    except requests.RequestException as error:
+        practicum_breaker.record_failure()
+        API_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, status=type(error).__name__
         )
-    except requests.RequestException:
         raise ConnectionError(
             output_logging_for_http_request(
-                main_msg=(
-                    'Ошибка при запросе,'
-                    f'статус код {response.reason}'
-                ),
+                main_msg=f'Ошибка при запросе: {error}',
                 params=params)
         )
+    record_practicum_status(response.status_code)
+    if response.status_code == HTTPStatus.NOT_MODIFIED:
+        data_json = response_cache.not_modified(cache_key)
+        if data_json is not None:
+            logger.debug(
+                HTTP_REQUEST_LOG_FORMAT,
+                'Ответ не изменился, данные взяты из кэша', ENDPOINT, params,
+                extra=request_log_fields(
+                    headers, response.status_code, latency
+                )
+            )
+            return data_json
     if response.status_code != HTTPStatus.OK:
         raise ValueError(
             output_logging_for_http_request(
@@ -129,46 +378,129 @@ def get_api_answer(timestamp):
                 params=params)
         )
     logger.debug(
-        msg=output_logging_for_http_request(
-            main_msg='Запрос успешно выполнен',
-            params=params
-        )
+        HTTP_REQUEST_LOG_FORMAT,
+        'Запрос успешно выполнен', ENDPOINT, params,
+        extra=request_log_fields(headers, response.status_code, latency)
     )
-    return response.json()
+    with profiler.span('decode_json'):
+        return response_cache.update(cache_key, response)
 
 
+def stream_homework_statuses(timestamp, headers, parser):
+    """
+    Потоковый запрос к yandex-API.
+    Отдаёт работы по мере чтения ответа из сокета, current_date
+    после исчерпания доступен в parser.current_date.
+    """
+    params = {
+        'from_date': timestamp,
+    }
+    logger.debug(
+        HTTP_REQUEST_LOG_FORMAT,
+        'Начало потокового GET запроса', ENDPOINT, params,
+        extra=request_log_fields(headers)
+    )
+    practicum_breaker.check()
+    started = time.perf_counter()
+    try:
+        response = api_retry_policy.get(
+            http_client.http_get,
+            ENDPOINT,
+            headers=headers,
+            params=params,
+            timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT),
+            stream=True
+        )
+    except requests.RequestException as error:
+        practicum_breaker.record_failure()
+        API_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, status=type(error).__name__
+        )
+        raise ConnectionError(
+            output_logging_for_http_request(
+                main_msg=f'Ошибка при запросе: {error}',
+                params=params)
+        )
+    with response:
+        API_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, status=int(response.status_code)
+        )
+        record_practicum_status(response.status_code)
+        if response.status_code != HTTPStatus.OK:
+            raise ValueError(
+                output_logging_for_http_request(
+                    main_msg=(
+                        f'Ошибка при запросе, статус код {response.reason}'
+                    ),
+                    params=params)
+            )
+        yield from iter_homeworks(
+            response.iter_content(chunk_size=STREAM_CHUNK_SIZE), parser
+        )
+
+
+def deliver_message(bot, chat_id, message):
+    """
+    Отправка сообщения из рабочего потока.
+    Если запущена очередь исходящих сообщений - только ставит в неё.
+    """
+    if outbox is not None:
+        outbox.put(chat_id, message)
+    else:
+        send_message_to_chat(bot=bot, chat_id=chat_id, message=message)
+
+
+def notify_from_stream(bot, chat_id, key, timestamp, headers):
+    """
+    Потоковая обработка ответа yandex-API.
+    Каждая работа проверяется и отправляется сразу после декодирования,
+    весь список работ в памяти не собирается. Сообщения идут в порядке
+    ответа. Статус запоминается сразу после отправки, поэтому если поток
+    оборвался посередине, уже отправленное не повторится в следующем
+    цикле. Возвращает (current_date, последние статусы работ).
+    """
+    parser = StreamingStatusParser()
+    latest = {}
+    for homework in stream_homework_statuses(timestamp, headers, parser):
+        previous = latest.get(homework.key)
+        last = (
+            (previous.status, previous.date_updated, None)
+            if previous else None
+        )
+        if not status_diff.is_change(key, homework, last):
+            continue
+        text = safe_parse_status(homework)
+        if text is not None:
+            deliver_message(bot, chat_id, text)
+        status_diff.record(key, [homework])
+        latest[homework.key] = homework
+    homeworks = list(latest.values())
+    return parser.current_date, homeworks
+
+
+@CHECK_RESPONSE_FAILURES.count_exceptions()
+@profiler.stage('check_response')
 def check_response(response):
     """
     Функция валидатор данных для парсинга.
     Проверяет что тело ответа приоразовано из json в словарь;
     что в это словаре есть ключ homeworks;
     что значением ключа homewirks будет список.
+    Ответ и все работы проверяются за один проход,
+    ошибка перечисляет все проблемы сразу.
     """
     logger.debug(
         msg='Начало выполнения функции check_response для валидации данных.'
     )
-    if not isinstance(response, dict):
-        raise TypeError(
-            ('Данные должны быть приобразованы из json в словарь.'
-             f'Пришёл тип данных {type(response)}.')
-        )
-    if 'current_date' not in response:
-        raise KeyError(
-            'В словаре response должен быть ключ current_date.')
-    if 'homeworks' not in response:
-        raise KeyError(
-            'В словаре response должен быть ключ homeworks.')
-    if not isinstance(response['homeworks'], list):
-        raise TypeError(
-            ('Значением \'homeworks\' должен быть список.'
-             f'Пришёл тип данных {type(response["homeworks"])}.')
-        )
+    status_response = StatusResponse.from_dict(response)
     logger.debug(
         msg='Данные в функции check_response успешно провалидированы.'
     )
-    return response['homeworks']
+    return status_response.homeworks
 
 
+@profiler.stage('parse_status')
+@PARSE_STATUS_FAILURES.count_exceptions()
 def parse_status(homework):
     """
     Функция подготавливает сообщения для отправки в чат.
@@ -180,46 +512,717 @@ def parse_status(homework):
         raise KeyError('В homework нет ключа \'homework_name\'.')
     if 'status' not in homework:
         raise KeyError('В homework нет ключа \'status\'.')
-    new_status = homework['status']
-    if new_status not in HOMEWORK_VERDICTS:
-        raise KeyError(f'В HOMEWORK_VERDICTS нет ключа \'{new_status}\'.')
-    homework_name = homework['homework_name']
-    verdict = HOMEWORK_VERDICTS[new_status]
-    logger.debug('Функция parse_status успешно отработала.')
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    text = message_templates.render(homework)
+    PARSE_STATUS_TOTAL.inc(status=homework['status'])
+    logger.debug(
+        'Функция parse_status успешно отработала.',
+        extra={'homework_id': homework.get('id')}
+    )
+    return text
+
+
+def safe_parse_status(homework):
+    """
+    Сообщение по работе или None, если его не удалось собрать.
+    Такая работа пишется в лог и не мешает остальным работам ответа.
+    """
+    try:
+        return parse_status(homework)
+    except (KeyError, TypeError, ValueError) as error:
+        logger.error(
+            'Работа %s пропущена, сообщение не собрано: %s',
+            homework_key(homework), error
+        )
+        return None
+
+
+def parse_statuses(homeworks):
+    """
+    Сообщения по всем работам из ответа.
+    Повторы одной работы с тем же статусом отбрасываются,
+    сообщения идут в хронологическом порядке по date_updated.
+    Работы, по которым сообщение не собрать, пропускаются.
+    """
+    unique = {}
+    for homework in homeworks:
+        key = (
+            homework.get('id', homework.get('homework_name')),
+            homework.get('status'),
+        )
+        unique.setdefault(key, homework)
+    ordered = sorted(
+        unique.values(),
+        key=lambda homework: homework.get('date_updated') or ''
+    )
+    messages = (safe_parse_status(homework) for homework in ordered)
+    return [text for text in messages if text is not None]
+
+
+def build_notifications(homeworks):
+    """
+    Тексты уведомлений по ответу API.
+    С COMBINE_NOTIFICATIONS изменения склеиваются в одно сообщение.
+    """
+    messages = parse_statuses(homeworks)
+    if COMBINE_NOTIFICATIONS:
+        return join_messages(messages, TELEGRAM_MESSAGE_LIMIT)
+    return messages
+
+
+def new_statuses(key, homeworks):
+    """Работы из ответа, у которых действительно сменился статус."""
+    return status_diff.changes(key, homeworks or ())
+
+
+def remember_statuses(key, homeworks):
+    """Сохраняет последние статусы работ подписки."""
+    status_diff.record(key, homeworks)
+
+
+def report_error(key, error):
+    """
+    Учитывает ошибку цикла опроса.
+    Возвращает текст уведомления или None, если в чат писать не нужно.
+    """
+    logger.error(f'Сбой в работе программы: {error}')
+    notice = error_aggregator.record_error(key, error)
+    if notice:
+        state_store.set_error(key, notice)
+    return notice
+
+
+def report_recovery(key):
+    """Сообщение о восстановлении после сбоя или None."""
+    notice = error_aggregator.record_success(key)
+    if notice:
+        state_store.set_error(key, None)
+    return notice
+
+
+def make_schedule():
+    """
+    Расписание опросов.
+    С ADAPTIVE_POLLING - адаптивное, иначе фиксированный RETRY_PERIOD.
+    """
+    if not ADAPTIVE_POLLING:
+        return FixedSchedule(RETRY_PERIOD)
+    return AdaptiveSchedule(
+        base_period=RETRY_PERIOD,
+        fast_period=FAST_RETRY_PERIOD,
+        max_period=MAX_RETRY_PERIOD,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        jitter=RETRY_JITTER,
+    )
 
 
 def main():
     """Основная логика работы бота."""
     check_tokens()
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    timestamp = int(time.time())
-    message = None
+    key = subscription_key(PRACTICUM_TOKEN, TELEGRAM_CHAT_ID)
+    timestamp = state_store.get_timestamp(key, int(time.time()))
+    error_aggregator.restore(key, state_store.get_error(key))
+    schedule = make_schedule()
     while True:
+        started = time.monotonic()
         try:
-            data_json = get_api_answer(timestamp)
-            homeworks = check_response(data_json)
-            if homeworks:
-                text = parse_status(data_json['homeworks'][0])
-                send_message(
-                    bot=bot,
-                    message=text
+            if STREAMING_RESPONSES:
+                timestamp, homeworks = notify_from_stream(
+                    bot, TELEGRAM_CHAT_ID, key, timestamp, HEADERS
                 )
             else:
+                data_json = request_homework_statuses(
+                    timestamp=timestamp,
+                    headers=HEADERS
+                )
+                homeworks = new_statuses(key, check_response(data_json))
+                for text in build_notifications(homeworks):
+                    send_message(
+                        bot=bot,
+                        message=text
+                    )
+                timestamp = data_json['current_date']
+            if not homeworks:
                 logger.debug('Обновлений домашней работы пока ещё нет.')
-            timestamp = data_json['current_date']
+            state_store.set_timestamp(key, timestamp)
+            remember_statuses(key, homeworks)
+            schedule.record_success(homeworks)
+            recovery = report_recovery(key)
+            if recovery:
+                send_message(bot=bot, message=recovery)
+        except Exception as error:
+            schedule.record_error()
+            notice = report_error(key, error)
+            if notice:
+                send_message(bot=bot, message=notice)
+        finally:
+            elapsed = time.monotonic() - started
+            CYCLE_SECONDS.observe(elapsed, loop='main')
+            delay = schedule.next_delay(elapsed)
+            with lifecycle.interruptible():
+                time.sleep(delay)
+
+
+async def async_fetch_homework_statuses(timestamp, headers):
+    """
+    Асинхронный запрос к yandex-API.
+    Блокирующий запрос выполняется в пуле потоков цикла событий.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, fetch_homework_statuses, timestamp, headers
+    )
+
+
+async def async_request_homework_statuses(timestamp, headers):
+    """Асинхронный вариант request_homework_statuses."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, request_homework_statuses, timestamp, headers
+    )
+
+
+async def async_notify_from_stream(bot, chat_id, key, timestamp, headers):
+    """Асинхронный вариант notify_from_stream."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, notify_from_stream, bot, chat_id, key, timestamp, headers
+    )
+
+
+async def async_get_api_answer(timestamp):
+    """Асинхронный вариант get_api_answer."""
+    return await async_fetch_homework_statuses(
+        timestamp=timestamp,
+        headers=HEADERS
+    )
+
+
+async def async_send_message_to_chat(bot, chat_id, message):
+    """
+    Асинхронная отправка сообщения в указанный чат телеграма.
+    Если запущена очередь исходящих сообщений - только ставит в неё.
+    """
+    if outbox is not None:
+        outbox.put(chat_id, message)
+        return
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(
+        None, send_message_to_chat, bot, chat_id, message
+    )
+
+
+async def async_send_message(bot, message):
+    """Асинхронный вариант send_message."""
+    await async_send_message_to_chat(
+        bot=bot,
+        chat_id=TELEGRAM_CHAT_ID,
+        message=message
+    )
+
+
+async def async_poll_statuses(bot, subscription):
+    """
+    Запрос статусов подписки и отправка уведомлений.
+    Возвращает (current_date, работы со сменившимся статусом).
+    """
+    data_json = await async_request_homework_statuses(
+        timestamp=subscription.timestamp,
+        headers=subscription.headers
+    )
+    changed = new_statuses(subscription.key, check_response(data_json))
+    for text in build_notifications(changed):
+        await async_send_message_to_chat(
+            bot=bot,
+            chat_id=subscription.chat_id,
+            message=text
+        )
+    return data_json['current_date'], changed
+
+
+async def async_poll_subscription(bot, subscription, semaphore):
+    """
+    Один цикл опроса для подписки из реестра.
+    Отправляет новый статус в чат подписки и сдвигает from_date.
+    """
+    async with semaphore:
+        try:
+            if STREAMING_RESPONSES:
+                current_date, homeworks = await async_notify_from_stream(
+                    bot, subscription.chat_id, subscription.key,
+                    subscription.timestamp, subscription.headers
+                )
+            else:
+                current_date, homeworks = await async_poll_statuses(
+                    bot, subscription
+                )
+            subscription.timestamp = current_date
+            state_store.set_timestamp(subscription.key, subscription.timestamp)
+            remember_statuses(subscription.key, homeworks)
+            if subscription.schedule is not None:
+                subscription.schedule.record_success(homeworks)
+            notice = report_recovery(subscription.key)
         except Exception as error:
-            new_message = f'Сбой в работе программы: {error}'
-            if message != new_message:
-                send_message(
-                    bot=bot,
-                    message=new_message
+            if subscription.schedule is not None:
+                subscription.schedule.record_error()
+            notice = report_error(subscription.key, error)
+        if notice:
+            await async_send_message_to_chat(
+                bot=bot,
+                chat_id=subscription.chat_id,
+                message=notice
+            )
+
+
+async def async_watch_subscription(bot, subscription, semaphore):
+    """
+    Бесконечный опрос одной подписки по её собственному расписанию.
+    Время запроса вычитается из паузы, чтобы циклы не дрейфовали.
+    Приостановленная командой /pause подписка не опрашивается.
+    """
+    loop = asyncio.get_running_loop()
+    subscription.schedule = make_schedule()
+    await asyncio.sleep(subscription.schedule.initial_delay())
+    while True:
+        started = loop.time()
+        if not subscription.paused:
+            await async_poll_subscription(bot, subscription, semaphore)
+        elapsed = loop.time() - started
+        CYCLE_SECONDS.observe(elapsed, loop='subscription')
+        await asyncio.sleep(subscription.schedule.next_delay(elapsed))
+
+
+async def async_handle_commands(bot, handler):
+    """
+    Приём команд из чатов телеграма long polling-ом.
+    Запросы идут через тот же пул соединений бота, что и отправка.
+    Ошибка в одной команде пишется в лог и не останавливает приём.
+    """
+    loop = asyncio.get_running_loop()
+    offset = None
+    while True:
+        try:
+            updates = await loop.run_in_executor(
+                None, functools.partial(
+                    bot.get_updates,
+                    offset=offset,
+                    timeout=COMMANDS_POLL_TIMEOUT,
+                    allowed_updates=['message'],
+                )
+            )
+        except telegram.TelegramError as error:
+            logger.error(f'Ошибка при получении команд из телеграма: {error}')
+            await asyncio.sleep(COMMANDS_ERROR_DELAY)
+            continue
+        for update in updates:
+            offset = update.update_id + 1
+            message = update.effective_message
+            if message is None:
+                continue
+            try:
+                reply = handler.handle(message.chat_id, message.text)
+                if reply:
+                    await async_send_message_to_chat(
+                        bot=bot,
+                        chat_id=message.chat_id,
+                        message=reply
+                    )
+            except Exception:
+                logger.exception(
+                    'Ошибка при обработке команды из чата %s.',
+                    message.chat_id
                 )
-                message = new_message
-            logger.error(new_message)
+
+
+def start_save(subscription):
+    """Сохраняет подписку в SUBSCRIPTIONS_FILE отдельной задачей."""
+    task = asyncio.get_running_loop().create_task(
+        async_save_subscription(subscription)
+    )
+    subscription_saves.add(task)
+    task.add_done_callback(subscription_saves.discard)
+    return task
+
+
+def start_watcher(bot, subscription, semaphore):
+    """Запускает опрос подписки отдельной задачей цикла событий."""
+    watcher = asyncio.get_running_loop().create_task(
+        async_watch_subscription(bot, subscription, semaphore)
+    )
+    subscription_watchers.add(watcher)
+    watcher.add_done_callback(subscription_watchers.discard)
+    return watcher
+
+
+def make_command_handler(bot, registry, semaphore):
+    """
+    Обработчик команд для полного реестра подписок всех шардов.
+    Новые подписки сразу начинают опрашиваться, если токен
+    принадлежит этому шарду. Новые подписки и /pause сохраняются
+    в SUBSCRIPTIONS_FILE, откуда их подхватывают остальные шарды.
+    """
+    def on_subscribe(subscription):
+        if hash_ring.owns(current_shard(), subscription.token):
+            start_watcher(bot, subscription, semaphore)
+        if SUBSCRIPTIONS_FILE:
+            start_save(subscription)
+
+    def on_pause(subscription):
+        if SUBSCRIPTIONS_FILE:
+            start_save(subscription)
+
+    return CommandHandler(
+        registry=registry,
+        status_diff=status_diff,
+        verdicts=HOMEWORK_VERDICTS,
+        on_subscribe=on_subscribe,
+        on_pause=on_pause,
+    )
+
+
+def sync_registry(registry):
+    """
+    Сверяет реестр с SUBSCRIPTIONS_FILE.
+    Переносит флаг paused и добавляет новые подписки из файла.
+    Возвращает новые подписки этого шарда - их пора опрашивать.
+    """
+    shard = current_shard()
+    added = []
+    for saved in SubscriptionRegistry.from_file(SUBSCRIPTIONS_FILE):
+        subscription = registry.get(saved.token, saved.chat_id)
+        if subscription is None:
+            subscription = registry.add(saved.token, saved.chat_id)
+            restore_subscription(subscription)
+            if hash_ring.owns(shard, subscription.token):
+                added.append(subscription)
+        subscription.paused = saved.paused
+    return added
+
+
+async def async_sync_subscriptions(bot, registry, semaphore):
+    """
+    Периодически перечитывает SUBSCRIPTIONS_FILE.
+    Команды принимает только шард 0, остальные шарды узнают
+    о новых подписках и /pause из файла.
+    """
+    while True:
+        await asyncio.sleep(SUBSCRIPTIONS_RELOAD_INTERVAL)
+        try:
+            added = sync_registry(registry)
+        except (OSError, ValueError, TypeError, KeyError) as error:
+            logger.error(f'Не удалось перечитать файл подписок: {error}')
+            continue
+        for subscription in added:
+            start_watcher(bot, subscription, semaphore)
+        if added:
+            logger.info('Новых подписок из файла: %s.', len(added))
+
+
+async def async_report_pool_stats():
+    """Периодически пишет в лог статистику пула соединений."""
+    while True:
+        await asyncio.sleep(RETRY_PERIOD)
+        stats = http_client.pool_stats()
+        if stats:
+            logger.debug('Статистика пула соединений: %s', stats)
+
+
+def current_shard():
+    """
+    Номер шарда процесса.
+    Берётся из SHARD_INDEX, а с SHARD_FROM_DYNO - из имени дайно;
+    None - номер не задан, и процесс сам запускает все шарды.
+    """
+    if SHARD_COUNT <= 1:
+        return 0
+    if SHARD_INDEX is not None:
+        shard = int(SHARD_INDEX)
+    elif SHARD_FROM_DYNO:
+        shard = dyno_shard_index(DYNO)
+        if shard is None:
+            msg = f'Из имени дайно {DYNO!r} не получить номер шарда.'
+            logger.critical(msg=msg)
+            raise SystemExit(msg)
+    else:
+        return None
+    if not 0 <= shard < SHARD_COUNT:
+        msg = f'Номер шарда {shard} вне диапазона 0..{SHARD_COUNT - 1}.'
+        logger.critical(msg=msg)
+        raise SystemExit(msg)
+    return shard
+
+
+def save_subscription(subscription):
+    """
+    Дописывает подписку в SUBSCRIPTIONS_FILE или обновляет её paused.
+    Файл перечитывается, чтобы не потерять подписки других шардов.
+    Одновременные сохранения из пула потоков идут по очереди.
+    """
+    with subscriptions_file_lock:
+        registry = SubscriptionRegistry.from_file(SUBSCRIPTIONS_FILE)
+        saved = registry.add(subscription.token, subscription.chat_id)
+        saved.paused = subscription.paused
+        registry.to_file(SUBSCRIPTIONS_FILE)
+
+
+async def async_save_subscription(subscription):
+    """
+    Асинхронный вариант save_subscription.
+    Файл читается и пишется в пуле потоков, а не на цикле событий.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(None, save_subscription, subscription)
+    except (OSError, ValueError, TypeError, KeyError) as error:
+        logger.error(f'Не удалось сохранить подписку в файл: {error}')
+
+
+def run_shards():
+    """
+    Запускает по процессу на каждый шард и ждёт их завершения.
+    Сигнал остановки пересылается всем шардам.
+    """
+    lifecycle.install()
+    processes = []
+    for shard in range(SHARD_COUNT):
+        env = {**os.environ, 'SHARD_INDEX': str(shard)}
+        if METRICS_PORT:
+            env['METRICS_PORT'] = str(METRICS_PORT + shard)
+        processes.append(subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__)], env=env
+        ))
+    logger.info('Запущено шардов: %s.', len(processes))
+    try:
+        while any(process.poll() is None for process in processes):
+            with lifecycle.interruptible():
+                time.sleep(1)
+    except ShutdownRequested:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=lifecycle.remaining())
+            except subprocess.TimeoutExpired:
+                process.kill()
+    finally:
+        lifecycle.close()
+    return [process.returncode for process in processes]
+
+
+def restore_subscription(subscription):
+    """Восстанавливает from_date и последнюю ошибку из хранилища."""
+    subscription.timestamp = state_store.get_timestamp(
+        subscription.key, subscription.timestamp
+    )
+    error_aggregator.restore(
+        subscription.key, state_store.get_error(subscription.key)
+    )
+
+
+def load_registry():
+    """
+    Собирает реестр подписок.
+    Подписки из SUBSCRIPTIONS_FILE и пара токенов из окружения.
+    Реестр полный, без деления на шарды: по нему шард 0 отвечает
+    на команды из всех чатов.
+    """
+    if SUBSCRIPTIONS_FILE:
+        registry = SubscriptionRegistry.from_file(SUBSCRIPTIONS_FILE)
+    else:
+        registry = SubscriptionRegistry()
+    if PRACTICUM_TOKEN and TELEGRAM_CHAT_ID:
+        registry.add(PRACTICUM_TOKEN, TELEGRAM_CHAT_ID)
+    for subscription in registry:
+        restore_subscription(subscription)
+    return registry
+
+
+def owned_subscriptions(registry):
+    """Подписки реестра, которые опрашивает шард этого процесса."""
+    shard = current_shard()
+    return [
+        subscription for subscription in registry
+        if hash_ring.owns(shard, subscription.token)
+    ]
+
+
+async def async_main():
+    """
+    Асинхронная логика работы бота.
+    Все подписки реестра опрашиваются на одном цикле событий.
+    При остановке состояние сбрасывается на диск до выхода из цикла:
+    asyncio.run ещё ждёт потоки с запросами, и сторож может завершить
+    процесс раньше, чем дойдёт до state_store.close().
+    """
+    if not TELEGRAM_TOKEN:
+        msg = 'Токен \'TELEGRAM_TOKEN\' из окружения не загрузился.'
+        logger.critical(msg=msg)
+        raise SystemExit(msg)
+    registry = load_registry()
+    if not len(registry) and SHARD_COUNT <= 1:
+        msg = 'В реестре нет ни одной подписки.'
+        logger.critical(msg=msg)
+        raise SystemExit(msg)
+    bot = telegram.Bot(
+        token=TELEGRAM_TOKEN,
+        base_url=TELEGRAM_API_URL,
+        request=Request(con_pool_size=MAX_CONCURRENT_POLLS)
+    )
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(
+        ThreadPoolExecutor(max_workers=MAX_CONCURRENT_POLLS)
+    )
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+    setup_outbox(bot)
+    tasks = [
+        async_watch_subscription(bot, subscription, semaphore)
+        for subscription in owned_subscriptions(registry)
+    ]
+    if SUBSCRIPTIONS_FILE:
+        tasks.append(async_sync_subscriptions(bot, registry, semaphore))
+    if TELEGRAM_COMMANDS and not current_shard():
+        tasks.append(async_handle_commands(
+            bot, make_command_handler(bot, registry, semaphore)
+        ))
+    watchers = asyncio.gather(async_report_pool_stats(), *tasks)
+    lifecycle.install_async(loop, watchers.cancel)
+    try:
+        await watchers
+    except asyncio.CancelledError:
+        if not lifecycle.stopping.is_set():
+            raise
+    finally:
+        try:
+            outbox.close(
+                timeout=min(OUTBOX_DRAIN_TIMEOUT, lifecycle.remaining())
+            )
         finally:
-            time.sleep(RETRY_PERIOD)
+            state_store.flush()
+
+
+def setup_outbox(bot):
+    """Запускает очередь исходящих сообщений телеграма."""
+    global outbox
+    outbox = Outbox(
+        bot=bot,
+        workers=OUTBOX_WORKERS,
+        global_rate=TELEGRAM_GLOBAL_RATE,
+        chat_rate=TELEGRAM_CHAT_RATE,
+        chat_burst=TELEGRAM_CHAT_BURST,
+        message_limit=TELEGRAM_MESSAGE_LIMIT,
+        breaker=telegram_breaker,
+    ).start()
+    return outbox
+
+
+def multi_tenant_main():
+    """Опрос всех подписок реестра из одного процесса."""
+    asyncio.run(async_main())
+
+
+def setup_http_session():
+    """Включает общий пул keep-alive соединений к yandex-API."""
+    if HTTP_KEEP_ALIVE:
+        http_client.configure_session(
+            pool_connections=1,
+            pool_maxsize=HTTP_POOL_SIZE,
+            connect_timeout=HTTP_CONNECT_TIMEOUT,
+            read_timeout=HTTP_READ_TIMEOUT,
+        )
+
+
+def setup_state_store():
+    """
+    Открывает хранилище состояния из STATE_BACKEND и STATE_PATH.
+    По умолчанию это файл homework_bot.sqlite3 в рабочем каталоге;
+    пустой STATE_PATH оставляет состояние только в памяти.
+    """
+    global state_store
+    state_store = open_state_store(
+        backend=STATE_BACKEND,
+        path=STATE_PATH,
+        flush_interval=STATE_FLUSH_INTERVAL,
+    )
+    state_store.start()
+    status_diff.store = state_store
+    return state_store
+
+
+def pool_hit_rate():
+    """Доля переиспользованных соединений пула для метрик."""
+    stats = http_client.pool_stats()
+    return stats['hit_rate'] if stats else None
+
+
+def outbox_pending():
+    """Число чатов в очереди исходящих сообщений для метрик."""
+    return outbox.pending() if outbox is not None else None
+
+
+def setup_metrics_server():
+    """Запускает HTTP-сервер /metrics, если задан METRICS_PORT."""
+    if not METRICS_PORT:
+        return None
+    REGISTRY.gauge_function(
+        'homework_http_pool_hit_rate',
+        'Доля запросов к yandex-API по уже открытому соединению.',
+        pool_hit_rate,
+    )
+    REGISTRY.gauge_function(
+        'homework_outbox_pending_chats',
+        'Чаты, которым ещё не отправлены сообщения.',
+        outbox_pending,
+    )
+    return start_metrics_server(port=METRICS_PORT)
+
+
+def setup_logging():
+    """
+    Вывод лога через очередь в фоновом потоке.
+    Опрос и отправка только кладут запись в очередь и не ждут stdout.
+    При LOG_FORMAT=json записи пишутся json-строками.
+    Уровень LOG_LEVEL задаётся корневому логгеру, чтобы записи
+    остальных модулей бота не отбрасывались на WARNING. Библиотеки
+    из LIBRARY_LOGGERS пишут не ниже WARNING.
+    """
+    global log_listener
+    if LOG_FORMAT == 'json':
+        handler.setFormatter(JsonFormatter())
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    for name in LIBRARY_LOGGERS:
+        logging.getLogger(name).setLevel(max(logging.WARNING, root.level))
+    logger.removeHandler(handler)
+    log_listener = start_queue_logging(root, handler)
+
+
+def run():
+    """Запуск бота в режиме, заданном окружением."""
+    setup_logging()
+    if SUBSCRIPTIONS_FILE and current_shard() is None:
+        try:
+            run_shards()
+        finally:
+            log_listener.stop()
+        return
+    setup_http_session()
+    setup_state_store()
+    setup_metrics_server()
+    lifecycle.install()
+    profiler.install(PROFILE_DUMP_PATH)
+    try:
+        if SUBSCRIPTIONS_FILE:
+            multi_tenant_main()
+        else:
+            main()
+    except ShutdownRequested:
+        pass
+    finally:
+        state_store.close()
+        lifecycle.close()
+        logger.info('Бот остановлен.')
+        log_listener.stop()
 
 
 if __name__ == '__main__':
-    main()
+    run()
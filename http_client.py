@@ -0,0 +1,106 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class PooledSession:
+    """
+    Переиспользуемая HTTP-сессия с пулом keep-alive соединений.
+    Считает запросы, чтобы по статистике пула видеть долю
+    переиспользованных соединений.
+    """
+
+    def __init__(self, pool_connections, pool_maxsize,
+                 connect_timeout, read_timeout):
+        """Сессия с пулом соединений и таймаутами запросов."""
+        self.timeout = (connect_timeout, read_timeout)
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+        )
+        self._session = requests.Session()
+        self._session.mount('https://', self._adapter)
+        self._session.mount('http://', self._adapter)
+        self._lock = threading.Lock()
+        self._requests = 0
+
+    def get(self, url, **kwargs):
+        """GET-запрос через пул соединений."""
+        kwargs.setdefault('timeout', self.timeout)
+        with self._lock:
+            self._requests += 1
+        return self._session.get(url, **kwargs)
+
+    def stats(self):
+        """
+        Статистика пула.
+        requests - отправлено запросов, connections - открыто соединений,
+        hit_rate - доля запросов, ушедших по уже открытому соединению.
+        """
+        pools = self._adapter.poolmanager.pools
+        connections = 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+        with self._lock:
+            sent = self._requests
+        hit_rate = 1 - connections / sent if sent else 0.0
+        return {
+            'requests': sent,
+            'connections': connections,
+            'pools': len(pools),
+            'hit_rate': max(hit_rate, 0.0),
+        }
+
+    def close(self):
+        """Закрывает все соединения пула."""
+        self._session.close()
+
+
+_session = None
+
+
+def configure_session(pool_connections, pool_maxsize,
+                      connect_timeout, read_timeout):
+    """Создаёт общую сессию, через которую пойдут запросы http_get."""
+    global _session
+    close_session()
+    _session = PooledSession(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+    )
+    return _session
+
+
+def get_session():
+    """Общая сессия или None, если она не настроена."""
+    return _session
+
+
+def close_session():
+    """Закрывает общую сессию."""
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
+
+def pool_stats():
+    """Статистика общей сессии или None."""
+    if _session is None:
+        return None
+    return _session.stats()
+
+
+def http_get(url, **kwargs):
+    """
+    GET-запрос через общую сессию.
+    Если сессия не настроена - обычный requests.get.
+    """
+    if _session is not None:
+        return _session.get(url, **kwargs)
+    return requests.get(url, **kwargs)
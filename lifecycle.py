@@ -0,0 +1,107 @@
+import logging
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+
+logger = logging.getLogger(__name__)
+
+STOP_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+
+class ShutdownRequested(BaseException):
+    """
+    Остановка бота по сигналу.
+    Наследуется от BaseException, чтобы не попасть в обработчики
+    except Exception цикла опроса.
+    """
+
+
+class Lifecycle:
+    """
+    Жизненный цикл процесса бота.
+    Ловит SIGTERM и SIGINT: сигнал во время паузы между опросами
+    сразу прерывает её, а посреди опроса только отмечает остановку,
+    чтобы не оборвать отправку сообщения. Если после сигнала процесс
+    не завершился за deadline секунд, он завершается принудительно.
+    """
+
+    def __init__(self, deadline=20):
+        """Жизненный цикл со сроком остановки deadline секунд."""
+        self.deadline = deadline
+        self.stopping = threading.Event()
+        self._stop_requested_at = None
+        self._interruptible = False
+        self._watchdog = None
+
+    def install(self, signals=STOP_SIGNALS):
+        """Ставит обработчики сигналов остановки."""
+        for signum in signals:
+            signal.signal(signum, self._handle)
+
+    def install_async(self, loop, callback, signals=STOP_SIGNALS):
+        """
+        Ставит обработчики сигналов в цикл событий.
+        callback вызывается один раз при первом сигнале.
+        """
+        def handle(signum):
+            if not self.stopping.is_set():
+                self.request_stop(signum)
+                callback()
+
+        for signum in signals:
+            loop.add_signal_handler(signum, handle, signum)
+
+    def request_stop(self, signum=None):
+        """Отмечает остановку и запускает отсчёт deadline."""
+        if self.stopping.is_set():
+            return
+        name = signal.Signals(signum).name if signum else 'stop'
+        logger.info('Получен сигнал %s, бот останавливается.', name)
+        self._stop_requested_at = time.monotonic()
+        self.stopping.set()
+        self._watchdog = threading.Timer(self.deadline, self._force_exit)
+        self._watchdog.daemon = True
+        self._watchdog.start()
+
+    def remaining(self):
+        """Сколько секунд осталось до принудительного завершения."""
+        if self._stop_requested_at is None:
+            return self.deadline
+        return max(
+            0.0, self.deadline - (time.monotonic() - self._stop_requested_at)
+        )
+
+    @contextmanager
+    def interruptible(self):
+        """
+        Участок, который сигнал остановки прерывает сразу.
+        Например, пауза между опросами.
+        """
+        self._interruptible = True
+        try:
+            if self.stopping.is_set():
+                raise ShutdownRequested()
+            yield
+        finally:
+            self._interruptible = False
+
+    def close(self):
+        """Штатное завершение: отменяет принудительную остановку."""
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+            self._watchdog = None
+
+    def _handle(self, signum, frame):
+        self.request_stop(signum)
+        if self._interruptible:
+            raise ShutdownRequested(signum)
+
+    def _force_exit(self):
+        logger.critical(
+            'Бот не остановился за %s с, завершение принудительно.',
+            self.deadline
+        )
+        os._exit(1)
@@ -0,0 +1,269 @@
+import bisect
+import threading
+import time
+from functools import wraps
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(
+        f'{name}="{_escape(value)}"' for name, value in pairs
+    ) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class _Metric:
+    """Общая часть метрик: имя, описание и метки."""
+
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labels):
+            raise ValueError(
+                f'Метрика {self.name} ожидает метки {self.labels}, '
+                f'переданы {tuple(labels)}.'
+            )
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def render(self):
+        """Строки метрики в текстовом формате Prometheus."""
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.kind}',
+            *self._samples(),
+        ]
+
+    def _samples(self):
+        return []
+
+
+class Counter(_Metric):
+    """Счётчик, который только растёт."""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labels=()):
+        """Счётчик с именем, описанием и именами меток."""
+        super().__init__(name, documentation, labels)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        """Увеличивает счётчик."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """Текущее значение счётчика."""
+        return self._values.get(self._key(labels), 0)
+
+    def count_exceptions(self, label='error'):
+        """
+        Декоратор: считает исключения функции.
+        В метку label пишется имя класса исключения.
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as error:
+                    self.inc(**{label: type(error).__name__})
+                    raise
+            return wrapper
+        return decorator
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f'{self.name}{_format_labels(self.labels, key)} '
+            f'{_format_value(value)}'
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Гистограмма значений, например длительностей в секундах."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(),
+                 buckets=DEFAULT_BUCKETS):
+        """Гистограмма с границами корзин buckets."""
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._values = {}
+
+    def observe(self, value, **labels):
+        """Учитывает одно значение."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [
+                    [0] * len(self.buckets), 0.0, 0
+                ]
+            counts[0][index] += 1
+            counts[1] += value
+            counts[2] += 1
+
+    def count(self, **labels):
+        """Сколько значений учтено."""
+        counts = self._values.get(self._key(labels))
+        return counts[2] if counts else 0
+
+    def time(self, **labels):
+        """Декоратор: пишет в гистограмму длительность вызова функции."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - started, **labels)
+            return wrapper
+        return decorator
+
+    def _samples(self):
+        with self._lock:
+            items = [
+                (key, list(buckets), total, count)
+                for key, (buckets, total, count) in self._values.items()
+            ]
+        samples = []
+        for key, buckets, total, count in items:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, buckets):
+                cumulative += bucket
+                labels = _format_labels(
+                    self.labels, key, [('le', _format_value(bound))]
+                )
+                samples.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labels, key)
+            samples.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            samples.append(f'{self.name}_count{labels} {count}')
+        return samples
+
+
+class GaugeFunction(_Metric):
+    """Показатель, значение которого вычисляется при каждом сборе."""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, function):
+        """Показатель, значение которого возвращает function."""
+        super().__init__(name, documentation)
+        self.function = function
+
+    def _samples(self):
+        value = self.function()
+        if value is None:
+            return []
+        return [f'{self.name} {_format_value(value)}']
+
+
+class MetricsRegistry:
+    """Реестр метрик процесса."""
+
+    def __init__(self):
+        """Пустой реестр метрик."""
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(
+                    f'Метрика {metric.name} уже зарегистрирована.'
+                )
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labels=()):
+        """Регистрирует счётчик."""
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(self, name, documentation, labels=(),
+                  buckets=DEFAULT_BUCKETS):
+        """Регистрирует гистограмму."""
+        return self._register(
+            Histogram(name, documentation, labels, buckets)
+        )
+
+    def gauge_function(self, name, documentation, function):
+        """Регистрирует вычисляемый показатель."""
+        return self._register(GaugeFunction(name, documentation, function))
+
+    def render(self):
+        """Все метрики в текстовом формате Prometheus."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Отдаёт метрики по адресу /metrics."""
+
+    def log_message(self, *args):
+        """Сборщик метрик ходит часто - журнал запросов не пишем."""
+
+    def do_GET(self):
+        """Ответ на запрос сборщика метрик."""
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        body = self.server.registry.render().encode()
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_metrics_server(port, host='0.0.0.0', registry=REGISTRY):
+    """Запускает HTTP-сервер метрик в фоновом потоке."""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(
+        target=server.serve_forever, name='metrics', daemon=True
+    ).start()
+    return server
@@ -0,0 +1,106 @@
+from validation import validate_status_response
+
+
+class Homework:
+    """
+    Компактная запись о работе из ответа yandex-API.
+    Хранит только используемые ботом поля; остальные поля ответа
+    отбрасываются при разборе. Поддерживает чтение как словарь
+    (homework['status'], homework.get('id'), 'status' in homework),
+    отсутствующие поля считаются отсутствующими ключами.
+    """
+
+    __slots__ = (
+        'id', 'homework_name', 'status', 'date_updated',
+        'reviewer_comment', 'lesson_name',
+    )
+
+    def __init__(self, id=None, homework_name=None, status=None,
+                 date_updated=None, reviewer_comment=None, lesson_name=None,
+                 **unused):
+        """Запись из полей ответа, лишние поля отбрасываются."""
+        self.id = id
+        self.homework_name = homework_name
+        self.status = status
+        self.date_updated = date_updated
+        self.reviewer_comment = reviewer_comment
+        self.lesson_name = lesson_name
+
+    @classmethod
+    def from_dict(cls, data):
+        """Запись из словаря ответа API."""
+        if not isinstance(data, dict):
+            raise TypeError(
+                'Элементы \'homeworks\' должны быть словарями. '
+                f'Пришёл тип данных {type(data)}.'
+            )
+        return cls(**data)
+
+    @property
+    def key(self):
+        """Идентификатор работы: id, а если его нет - название."""
+        return self.id if self.id is not None else self.homework_name
+
+    def keys(self):
+        """Поля, которые есть в записи."""
+        return [
+            field for field in self.__slots__
+            if getattr(self, field) is not None
+        ]
+
+    def get(self, field, default=None):
+        """Значение поля или default, если поля нет."""
+        value = getattr(self, field, None)
+        return default if value is None else value
+
+    def __getitem__(self, field):
+        """Значение поля; KeyError, если поля нет."""
+        value = getattr(self, field, None) if isinstance(field, str) else None
+        if value is None:
+            raise KeyError(field)
+        return value
+
+    def __contains__(self, field):
+        """Есть ли поле в записи."""
+        return self.get(field) is not None
+
+    def __eq__(self, other):
+        """Записи равны, если совпадают все поля."""
+        if not isinstance(other, Homework):
+            return NotImplemented
+        return all(
+            getattr(self, field) == getattr(other, field)
+            for field in self.__slots__
+        )
+
+    def __repr__(self):
+        """Представление записи с заполненными полями."""
+        fields = ', '.join(
+            f'{field}={getattr(self, field)!r}' for field in self.keys()
+        )
+        return f'Homework({fields})'
+
+
+class StatusResponse:
+    """Проверенный ответ homework_statuses."""
+
+    __slots__ = ('homeworks', 'current_date')
+
+    def __init__(self, homeworks, current_date):
+        """Модель из уже проверенных работ и current_date."""
+        self.homeworks = homeworks
+        self.current_date = current_date
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Проверяет ответ API и собирает модель.
+        Ответ и все работы проверяются за один проход,
+        ошибка перечисляет все проблемы.
+        Работы сразу переводятся в компактные записи Homework.
+        """
+        validate_status_response(data)
+        return cls(
+            homeworks=[Homework(**homework) for homework in data['homeworks']],
+            current_date=data['current_date'],
+        )
@@ -0,0 +1,314 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+
+import telegram
+
+from metrics import REGISTRY
+
+
+logger = logging.getLogger(__name__)
+
+MIN_CIRCUIT_DELAY = 1.0
+
+TELEGRAM_SEND_SECONDS = REGISTRY.histogram(
+    'homework_telegram_send_seconds',
+    'Длительность отправки сообщений в телеграм.',
+    labels=('outcome',),
+)
+TELEGRAM_SEND_FAILURES = REGISTRY.counter(
+    'homework_telegram_send_failures_total',
+    'Ошибки отправки сообщений в телеграм.',
+    labels=('error',),
+)
+
+
+def is_telegram_outage(error):
+    """
+    Говорит ли ошибка о недоступности телеграма.
+    BadRequest - ошибка конкретного запроса, а не сбой сервиса.
+    """
+    return (
+        isinstance(error, telegram.error.NetworkError)
+        and not isinstance(error, telegram.error.BadRequest)
+    )
+
+
+def join_messages(messages, limit):
+    """
+    Склеивает сообщения в блоки не длиннее limit символов.
+    Блоков получается как можно меньше.
+    """
+    joined = []
+    for message in messages:
+        if joined and len(joined[-1]) + 2 + len(message) <= limit:
+            joined[-1] = f'{joined[-1]}\n\n{message}'
+        else:
+            joined.append(message)
+    return joined
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты "ведро с токенами".
+    rate - токенов в секунду, capacity - размер допустимого всплеска.
+    """
+
+    __slots__ = ('rate', 'capacity', '_tokens', '_updated', '_lock')
+
+    def __init__(self, rate, capacity=1):
+        """Полное ведро из capacity токенов."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Пытается взять токен.
+        Возвращает 0, если токен взят, иначе сколько секунд ждать.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Берёт токен, при необходимости дожидаясь его."""
+        while True:
+            delay = self.reserve()
+            if not delay:
+                return
+            time.sleep(delay)
+
+
+class Outbox:
+    """
+    Очередь исходящих сообщений телеграма.
+    Пул потоков разбирает очередь с ограничением частоты отправки
+    на весь бот и на каждый чат. Сообщения, накопившиеся для одного
+    чата, склеиваются в одно. На RetryAfter чат откладывается
+    на указанное сервером время, при разомкнутом предохранителе
+    breaker - до пробного вызова.
+    """
+
+    def __init__(self, bot, workers=4, global_rate=30, chat_rate=1,
+                 chat_burst=1, message_limit=4096, breaker=None):
+        """Очередь поверх бота с заданными лимитами частоты."""
+        self.bot = bot
+        self.message_limit = message_limit
+        self.breaker = breaker
+        self._global_bucket = TokenBucket(global_rate, capacity=global_rate)
+        self._chat_rate = chat_rate
+        self._chat_burst = chat_burst
+        self._chat_buckets = {}
+        self._pending = {}
+        self._ready = deque()
+        self._delayed = []
+        self._delayed_chats = set()
+        self._sequence = itertools.count()
+        self._in_flight = set()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._stopping = False
+        self._workers = [
+            threading.Thread(
+                target=self._work, name=f'outbox-{number}', daemon=True
+            )
+            for number in range(workers)
+        ]
+        self.sent = 0
+        self.coalesced = 0
+        self.retried = 0
+
+    def start(self):
+        """Запускает потоки отправки."""
+        for worker in self._workers:
+            worker.start()
+        return self
+
+    def put(self, chat_id, text):
+        """Ставит сообщение в очередь, не дожидаясь отправки."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('Очередь сообщений уже закрыта.')
+            texts = self._pending.get(chat_id)
+            if texts is not None:
+                texts.append(text)
+                self.coalesced += 1
+                return
+            self._pending[chat_id] = [text]
+            if (
+                chat_id not in self._in_flight
+                and chat_id not in self._delayed_chats
+            ):
+                self._ready.append(chat_id)
+                self._condition.notify()
+
+    def pending(self):
+        """Число чатов, которым ещё не отправлены сообщения."""
+        with self._condition:
+            return len(self._pending) + len(self._in_flight)
+
+    def close(self, timeout=None):
+        """
+        Перестаёт принимать сообщения и дожидается отправки очереди.
+        Возвращает число чатов, которым не успели отправить сообщения.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._closed = True
+            while self._pending or self._in_flight:
+                remaining = (
+                    None if deadline is None
+                    else deadline - time.monotonic()
+                )
+                if remaining is not None and remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            undelivered = len(self._pending) + len(self._in_flight)
+            self._stopping = True
+            self._condition.notify_all()
+        for worker in self._workers:
+            if worker.is_alive():
+                worker.join(timeout=0 if undelivered else None)
+        if undelivered:
+            logger.warning(
+                f'Не отправлены сообщения в {undelivered} чатов.'
+            )
+        return undelivered
+
+    def _chat_bucket(self, chat_id):
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(self._chat_rate, capacity=self._chat_burst)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    def _delay(self, chat_id, ready_at):
+        self._delayed_chats.add(chat_id)
+        heapq.heappush(
+            self._delayed, (ready_at, next(self._sequence), chat_id)
+        )
+        self._condition.notify()
+
+    def _take(self):
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                while self._delayed and self._delayed[0][0] <= now:
+                    _, _, chat_id = heapq.heappop(self._delayed)
+                    self._delayed_chats.discard(chat_id)
+                    self._ready.append(chat_id)
+                if self._stopping:
+                    return None, None
+                if self._ready:
+                    chat_id = self._ready.popleft()
+                    wait = self._chat_bucket(chat_id).reserve()
+                    if wait:
+                        self._delay(chat_id, now + wait)
+                        continue
+                    self._in_flight.add(chat_id)
+                    return chat_id, self._pending.pop(chat_id)
+                timeout = (
+                    self._delayed[0][0] - now if self._delayed else None
+                )
+                self._condition.wait(timeout)
+
+    def _release(self, chat_id, sent, retry_texts=None, retry_after=0):
+        with self._condition:
+            self.sent += sent
+            self._in_flight.discard(chat_id)
+            if retry_texts:
+                self._pending[chat_id] = (
+                    retry_texts + self._pending.get(chat_id, [])
+                )
+                self.retried += 1
+                self._delay(chat_id, time.monotonic() + retry_after)
+            elif (
+                chat_id in self._pending
+                and chat_id not in self._delayed_chats
+            ):
+                self._ready.append(chat_id)
+            self._condition.notify_all()
+
+    def _deliver(self, chat_id, texts):
+        chunks = join_messages(texts, self.message_limit)
+        sent = 0
+        for number, chunk in enumerate(chunks):
+            if self.breaker is not None and not self.breaker.allow():
+                return sent, chunks[number:], max(
+                    self.breaker.retry_after(), MIN_CIRCUIT_DELAY
+                )
+            self._global_bucket.acquire()
+            started = time.perf_counter()
+            try:
+                self.bot.send_message(chat_id=chat_id, text=chunk)
+            except telegram.error.RetryAfter as error:
+                self._record(error)
+                TELEGRAM_SEND_SECONDS.observe(
+                    time.perf_counter() - started, outcome='retry_after'
+                )
+                TELEGRAM_SEND_FAILURES.inc(error=type(error).__name__)
+                logger.warning(
+                    f'Телеграм просит подождать {error.retry_after} с '
+                    f'перед отправкой в чат {chat_id}.'
+                )
+                return sent, chunks[number:], error.retry_after
+            except telegram.TelegramError as error:
+                self._record(error)
+                TELEGRAM_SEND_SECONDS.observe(
+                    time.perf_counter() - started, outcome='error'
+                )
+                TELEGRAM_SEND_FAILURES.inc(error=type(error).__name__)
+                logger.error(
+                    f'Ошибка при отправке сообщения "{chunk}" '
+                    f'в чат телеграма {chat_id}: {error}'
+                )
+            else:
+                self._record()
+                TELEGRAM_SEND_SECONDS.observe(
+                    time.perf_counter() - started, outcome='ok'
+                )
+                sent += 1
+                logger.debug(
+                    'Сообщение "%s" успешно отправлено в чат телеграма %s',
+                    chunk, chat_id
+                )
+        return sent, None, 0
+
+    def _record(self, error=None):
+        if self.breaker is None:
+            return
+        if is_telegram_outage(error):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def _work(self):
+        while True:
+            chat_id, texts = self._take()
+            if chat_id is None:
+                return
+            sent, retry_texts, retry_after = 0, None, 0
+            try:
+                sent, retry_texts, retry_after = self._deliver(
+                    chat_id, texts
+                )
+            except Exception as error:
+                logger.error(
+                    f'Сбой при отправке сообщений в чат {chat_id}: {error}'
+                )
+            finally:
+                self._release(chat_id, sent, retry_texts, retry_after)
@@ -0,0 +1,92 @@
+import random
+
+
+class FixedSchedule:
+    """Постоянная пауза между опросами, как в RETRY_PERIOD."""
+
+    def __init__(self, period):
+        """Расписание с постоянной паузой period."""
+        self.period = period
+
+    def record_success(self, homeworks):
+        """Успешный опрос на расписание не влияет."""
+
+    def record_error(self):
+        """Ошибка опроса на расписание не влияет."""
+
+    def initial_delay(self):
+        """Первый опрос - сразу."""
+        return 0
+
+    def next_delay(self, elapsed=0.0):
+        """Пауза до следующего опроса."""
+        return self.period
+
+
+class AdaptiveSchedule:
+    """
+    Адаптивное расписание опросов.
+    Пока работа на ревью - опрашивает часто, в простое и при ошибках
+    экспоненциально увеличивает паузу. Пауза размывается jitter,
+    время самого запроса вычитается, чтобы циклы не дрейфовали.
+    """
+
+    REVIEWING_STATUS = 'reviewing'
+    MAX_BACKOFF_EXPONENT = 32
+
+    def __init__(self, base_period, fast_period, max_period,
+                 backoff_factor=2, jitter=0.1):
+        """Расписание с паузами от fast_period до max_period."""
+        self.base_period = base_period
+        self.fast_period = fast_period
+        self.max_period = max_period
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self._reviewing = set()
+        self._idle_streak = 0
+        self._error_streak = 0
+
+    @property
+    def reviewing(self):
+        """Есть ли работы, которые сейчас на ревью."""
+        return bool(self._reviewing)
+
+    def record_success(self, homeworks):
+        """Учитывает статусы работ из успешного ответа."""
+        self._error_streak = 0
+        for homework in homeworks or ():
+            key = homework.get('id', homework.get('homework_name'))
+            if homework.get('status') == self.REVIEWING_STATUS:
+                self._reviewing.add(key)
+            else:
+                self._reviewing.discard(key)
+        if homeworks or self._reviewing:
+            self._idle_streak = 0
+        else:
+            self._idle_streak += 1
+
+    def record_error(self):
+        """Учитывает неудачный опрос."""
+        self._error_streak += 1
+
+    def initial_delay(self):
+        """Случайный сдвиг первого опроса, чтобы воркеры не шли толпой."""
+        return random.uniform(0, self.base_period * self.jitter)
+
+    def _backoff(self, streak):
+        if streak <= 1:
+            return self.base_period
+        exponent = min(streak - 1, self.MAX_BACKOFF_EXPONENT)
+        return self.base_period * self.backoff_factor ** exponent
+
+    def next_delay(self, elapsed=0.0):
+        """Пауза до следующего опроса с учётом длительности запроса."""
+        if self._error_streak:
+            delay = self._backoff(self._error_streak)
+        elif self._reviewing:
+            delay = self.fast_period
+        else:
+            delay = self._backoff(self._idle_streak)
+        delay = min(delay, self.max_period)
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(delay - elapsed, 0.0)
@@ -0,0 +1,140 @@
+import collections
+import contextlib
+import functools
+import logging
+import signal
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+_DISABLED_SPAN = contextlib.nullcontext()
+
+
+class StageTiming:
+    """Замер одного этапа: путь вложенных этапов и времена в секундах."""
+
+    __slots__ = ('path', 'wall', 'cpu', 'self_wall')
+
+    def __init__(self, path, wall, cpu, self_wall):
+        """Замер этапа по пути path."""
+        self.path = path
+        self.wall = wall
+        self.cpu = cpu
+        self.self_wall = self_wall
+
+    def __repr__(self):
+        """Представление замера с путём и временами."""
+        return (
+            f'StageTiming({";".join(self.path)!r}, wall={self.wall:.6f}, '
+            f'cpu={self.cpu:.6f})'
+        )
+
+
+class _Frame:
+    """Этап, который выполняется в текущем потоке."""
+
+    __slots__ = ('name', 'children_wall')
+
+    def __init__(self, name):
+        self.name = name
+        self.children_wall = 0.0
+
+
+class Profiler:
+    """
+    Замеры этапов цикла опроса.
+    Обёрнутые этапы пишут время по часам и процессорное время потока
+    в кольцевой буфер из capacity последних замеров. Вложенные этапы
+    складываются в стек, так что буфер можно выгрузить в формате
+    folded stacks для flamegraph.pl и speedscope.
+    Выключенный профайлер возвращает функции без обёрток.
+    """
+
+    def __init__(self, enabled=False, capacity=10000):
+        """Профайлер с буфером из capacity замеров."""
+        self.enabled = enabled
+        self._timings = collections.deque(maxlen=capacity)
+        self._local = threading.local()
+
+    def stage(self, name):
+        """Декоратор этапа name."""
+        def decorator(func):
+            if not self.enabled:
+                return func
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def span(self, name):
+        """Контекстный менеджер этапа name внутри функции."""
+        if not self.enabled:
+            return _DISABLED_SPAN
+        return self._measure(name)
+
+    @contextlib.contextmanager
+    def _measure(self, name):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        frame = _Frame(name)
+        stack.append(frame)
+        wall_started = time.perf_counter()
+        cpu_started = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_started
+            cpu = time.thread_time() - cpu_started
+            path = tuple(item.name for item in stack)
+            stack.pop()
+            if stack:
+                stack[-1].children_wall += wall
+            self._timings.append(StageTiming(
+                path, wall, cpu, max(0.0, wall - frame.children_wall)
+            ))
+
+    def timings(self):
+        """Замеры из буфера, от старых к новым."""
+        return list(self._timings)
+
+    def folded(self):
+        """
+        Буфер в формате folded stacks.
+        Строка на стек этапов, вес - собственное время этапа
+        в микросекундах.
+        """
+        totals = collections.Counter()
+        for timing in self.timings():
+            totals[';'.join(timing.path)] += timing.self_wall
+        return ''.join(
+            f'{path} {round(seconds * 1_000_000)}\n'
+            for path, seconds in sorted(totals.items())
+        )
+
+    def dump(self, path):
+        """Записывает folded stacks в файл path."""
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(self.folded())
+        logger.info('Профиль этапов записан в %s.', path)
+
+    def install(self, path, signum=getattr(signal, 'SIGUSR1', None)):
+        """
+        Выгрузка профиля в path по сигналу signum.
+        На платформах без SIGUSR1 ничего не делает.
+        """
+        if not self.enabled or signum is None:
+            return
+
+        def handle(signum, frame):
+            try:
+                self.dump(path)
+            except OSError as error:
+                logger.error('Не удалось записать профиль: %s', error)
+
+        signal.signal(signum, handle)
@@ -0,0 +1,89 @@
+import threading
+from collections import OrderedDict
+
+
+class CachedResponse:
+    """Закэшированный ответ: валидаторы и разобранный json."""
+
+    __slots__ = ('etag', 'last_modified', 'data')
+
+    def __init__(self, etag, last_modified, data):
+        """Запись кэша по заголовкам и телу ответа."""
+        self.etag = etag
+        self.last_modified = last_modified
+        self.data = data
+
+    def validators(self):
+        """Заголовки условного запроса."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    LRU-кэш последнего ответа yandex-API для каждого токена.
+    from_date меняется каждый цикл, а тело ответа содержит current_date,
+    поэтому ключ - только токен, а сравниваются не тела, а валидаторы:
+    на условный запрос с ними сервер отвечает 304 без тела, и данные
+    берутся из кэша без разбора json.
+    """
+
+    def __init__(self, maxsize):
+        """Пустой кэш не больше чем на maxsize ответов."""
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Запись кэша или None."""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+            return cached
+
+    def not_modified(self, key):
+        """Данные для ответа 304 или None, если в кэше ничего нет."""
+        cached = self.get(key)
+        if cached is None:
+            return None
+        self._count(hit=True)
+        return cached.data
+
+    def update(self, key, response):
+        """
+        Разбирает ответ и запоминает его, если у него есть валидаторы.
+        Возвращает разобранные данные.
+        """
+        self._count(hit=False)
+        data = response.json()
+        headers = getattr(response, 'headers', None) or {}
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if self.maxsize and (etag or last_modified):
+            self._store(key, CachedResponse(etag, last_modified, data))
+        return data
+
+    def _store(self, key, cached):
+        with self._lock:
+            self._entries[key] = cached
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def __len__(self):
+        """Число ответов в кэше."""
+        return len(self._entries)
@@ -0,0 +1,97 @@
+import logging
+import random
+import time
+from http import HTTPStatus
+
+import requests
+
+from metrics import REGISTRY
+
+
+logger = logging.getLogger(__name__)
+
+RETRIES_TOTAL = REGISTRY.counter(
+    'homework_api_retries_total',
+    'Повторные запросы к yandex-API.',
+    labels=('reason',),
+)
+
+
+def is_retryable_status(status_code):
+    """Стоит ли повторить запрос с таким статусом ответа: 5xx и 429."""
+    return (
+        status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+        or status_code == HTTPStatus.TOO_MANY_REQUESTS
+    )
+
+
+def retry_after_seconds(response):
+    """Пауза из заголовка Retry-After в секундах или None."""
+    value = getattr(response, 'headers', {}).get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class RetryPolicy:
+    """
+    Повторы GET-запроса внутри одного цикла опроса.
+    Повторяются только безопасные случаи: ошибка соединения, ответы
+    5xx и 429. Паузы растут экспоненциально со случайным разбросом
+    jitter, на 429 и 503 берутся из Retry-After. Все попытки
+    укладываются в budget секунд: если пауза в него не помещается,
+    возвращается последний результат.
+    """
+
+    def __init__(self, attempts=3, base_delay=0.25, max_delay=2,
+                 jitter=0.1, budget=10):
+        """Политика повторов с заданными паузами и бюджетом."""
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.budget = budget
+
+    def backoff(self, attempt):
+        """Пауза перед повтором после попытки attempt (с нуля)."""
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def get(self, request, *args, **kwargs):
+        """Выполняет request(*args, **kwargs) с повторами."""
+        deadline = time.monotonic() + self.budget
+        attempt = 0
+        while True:
+            error = response = None
+            try:
+                response = request(*args, **kwargs)
+            except requests.ConnectionError as connection_error:
+                error = connection_error
+                reason = type(error).__name__
+                delay = self.backoff(attempt)
+            else:
+                if not is_retryable_status(response.status_code):
+                    return response
+                reason = str(int(response.status_code))
+                delay = retry_after_seconds(response)
+                if delay is None:
+                    delay = self.backoff(attempt)
+            attempt += 1
+            if (
+                attempt >= self.attempts
+                or time.monotonic() + delay > deadline
+            ):
+                if error is not None:
+                    raise error
+                return response
+            if hasattr(response, 'close'):
+                response.close()
+            RETRIES_TOTAL.inc(reason=reason)
+            logger.warning(
+                'Запрос к yandex-API не удался (%s), попытка %s из %s '
+                'через %.2f с.', reason, attempt + 1, self.attempts, delay
+            )
+            time.sleep(delay)
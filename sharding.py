@@ -0,0 +1,51 @@
+import bisect
+import hashlib
+
+
+def ring_hash(value):
+    """Позиция значения на кольце."""
+    return int.from_bytes(
+        hashlib.blake2b(value.encode(), digest_size=8).digest(), 'big'
+    )
+
+
+def dyno_shard_index(dyno):
+    """
+    Номер шарда из имени дайно Heroku.
+    worker.1 - шард 0, worker.2 - шард 1; для других имён - None.
+    """
+    if not dyno or '.' not in dyno:
+        return None
+    number = dyno.rsplit('.', 1)[1]
+    return int(number) - 1 if number.isdigit() else None
+
+
+class HashRing:
+    """
+    Кольцо консистентного хэширования токенов по шардам.
+    У каждого шарда replicas виртуальных точек на кольце, токен
+    достаётся шарду ближайшей точки по часовой стрелке. При смене
+    числа шардов переезжает только около 1/N токенов.
+    """
+
+    def __init__(self, shard_count, replicas=128):
+        """Кольцо из shard_count шардов по replicas точек."""
+        if shard_count < 1:
+            raise ValueError('Число шардов должно быть не меньше 1.')
+        self.shard_count = shard_count
+        points = sorted(
+            (ring_hash(f'shard-{shard}-{replica}'), shard)
+            for shard in range(shard_count)
+            for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_for(self, token):
+        """Номер шарда, который опрашивает токен."""
+        index = bisect.bisect(self._hashes, ring_hash(token))
+        return self._shards[index % len(self._shards)]
+
+    def owns(self, shard, token):
+        """Опрашивает ли шард shard этот токен."""
+        return self.shard_count == 1 or self.shard_for(token) == shard
@@ -0,0 +1,65 @@
+import threading
+
+from metrics import REGISTRY
+
+
+REQUESTS_COALESCED = REGISTRY.counter(
+    'homework_requests_coalesced_total',
+    'Вызовы, дождавшиеся результата такого же вызова в полёте.',
+    labels=('name',),
+)
+
+
+class _Call:
+    """Вызов в полёте и его результат."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Склейка одинаковых одновременных вызовов.
+    Пока вызов с ключом key выполняется, остальные вызовы с тем же
+    ключом не идут во внешний сервис, а ждут и получают тот же
+    результат или то же исключение.
+    """
+
+    def __init__(self, name):
+        """Склейка вызовов; name - метка в метриках."""
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        """Вызывает func или дожидается такого же вызова в полёте."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            REQUESTS_COALESCED.inc(name=self.name)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        """Число вызовов в полёте."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,105 @@
+def homework_key(homework):
+    """Идентификатор работы: id, а если его нет - название."""
+    return homework.get('id', homework.get('homework_name'))
+
+
+class StatusDiff:
+    """
+    Поиск настоящих смен статусов работ.
+    Хранит последний статус, date_updated и название каждой работы
+    в индексе ключ подписки -> id работы, поэтому проверка
+    одной работы - два поиска в словаре. Повтор уже известного
+    статуса, например из-за сдвига часов или повторного
+    current_date, сменой не считается.
+    Для работ, которых нет в индексе, статус берётся из store.
+    """
+
+    def __init__(self, store=None):
+        """Пустой индекс поверх хранилища store."""
+        self.store = store
+        self._index = {}
+
+    def last(self, key, homework_id):
+        """
+        Последнее известное состояние работы или None.
+        Кортеж (status, date_updated, homework_name).
+        """
+        known = self._index.get(key, {}).get(str(homework_id))
+        if known is None and self.store is not None:
+            status = self.store.get_status(key, homework_id)
+            if status is not None:
+                known = (status, None, None)
+        return known
+
+    def statuses(self, key):
+        """
+        Последние известные статусы работ подписки.
+        Словарь id работы -> (status, date_updated, homework_name).
+        """
+        known = {}
+        if self.store is not None:
+            known.update(
+                (homework_id, (status, None, None))
+                for homework_id, status in self.store.get_statuses(key)
+            )
+        known.update(self._index.get(key, {}))
+        return known
+
+    def is_change(self, key, homework, last=None):
+        """Отличается ли работа от последнего известного состояния."""
+        if last is None:
+            last = self.last(key, homework_key(homework))
+        if last is None:
+            return True
+        status, date_updated = last[0], last[1]
+        if homework.get('status') != status:
+            return True
+        current_date = homework.get('date_updated')
+        return bool(
+            date_updated and current_date and current_date > date_updated
+        )
+
+    def changes(self, key, homeworks):
+        """
+        Работы из ответа, у которых действительно сменился статус.
+        Работы идут в хронологическом порядке, несколько смен одной
+        работы в одном ответе сравниваются друг с другом.
+        """
+        ordered = sorted(
+            homeworks,
+            key=lambda homework: homework.get('date_updated') or ''
+        )
+        batch = {}
+        changed = []
+        for homework in ordered:
+            homework_id = homework_key(homework)
+            last = batch.get(homework_id) or self.last(key, homework_id)
+            if self.is_change(key, homework, last):
+                changed.append(homework)
+            batch[homework_id] = (
+                homework.get('status'), homework.get('date_updated'), None
+            )
+        return changed
+
+    def record(self, key, homeworks):
+        """Запоминает статусы работ подписки."""
+        ordered = sorted(
+            homeworks or (),
+            key=lambda homework: homework.get('date_updated') or ''
+        )
+        for homework in ordered:
+            homework_id = homework_key(homework)
+            status = homework.get('status')
+            if homework_id is None or status is None:
+                continue
+            self._index.setdefault(key, {})[str(homework_id)] = (
+                status,
+                homework.get('date_updated'),
+                homework.get('homework_name'),
+            )
+            if self.store is not None:
+                self.store.set_status(key, homework_id, status)
+
+    def __len__(self):
+        """Число работ в индексе."""
+        return sum(len(homeworks) for homeworks in self._index.values())
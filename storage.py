@@ -0,0 +1,277 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+class StateStore:
+    """
+    Хранилище состояния бота.
+    По ключу подписки хранит from_date, последний статус каждой работы
+    и последнюю ошибку.
+    Чтение и запись идут в память, на диск изменения сбрасываются
+    пачкой из фонового потока, чтобы не тормозить цикл опроса.
+    Базовый класс ничего не сохраняет на диск.
+    """
+
+    def __init__(self, flush_interval=5):
+        """Пустое хранилище со сбросом раз в flush_interval."""
+        self.flush_interval = flush_interval
+        self._timestamps = {}
+        self._errors = {}
+        self._statuses = {}
+        self._dirty_keys = set()
+        self._dirty_statuses = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher = None
+
+    def get_timestamp(self, key, default=None):
+        """Последний current_date подписки."""
+        return self._timestamps.get(key, default)
+
+    def set_timestamp(self, key, timestamp):
+        """Запоминает current_date подписки."""
+        with self._lock:
+            if self._timestamps.get(key) != timestamp:
+                self._timestamps[key] = timestamp
+                self._dirty_keys.add(key)
+
+    def get_error(self, key):
+        """Текст последней ошибки, о которой сообщили в чат."""
+        return self._errors.get(key)
+
+    def set_error(self, key, message):
+        """Запоминает текст последней ошибки."""
+        with self._lock:
+            if self._errors.get(key) != message:
+                self._errors[key] = message
+                self._dirty_keys.add(key)
+
+    def get_status(self, key, homework_id):
+        """Последний известный статус работы."""
+        return self._statuses.get((key, str(homework_id)))
+
+    def get_statuses(self, key):
+        """
+        Пары (id работы, статус) подписки.
+        Перебирает все статусы, поэтому не для цикла опроса.
+        """
+        with self._lock:
+            return [
+                (homework_id, status)
+                for (status_key, homework_id), status
+                in self._statuses.items()
+                if status_key == key
+            ]
+
+    def set_status(self, key, homework_id, status):
+        """Запоминает статус работы."""
+        homework_id = str(homework_id)
+        with self._lock:
+            if self._statuses.get((key, homework_id)) != status:
+                self._statuses[(key, homework_id)] = status
+                self._dirty_statuses.add((key, homework_id))
+
+    def flush(self):
+        """Сбрасывает накопленные изменения на диск одной пачкой."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty_keys and not self._dirty_statuses:
+                    return
+                subscriptions = [
+                    (key, self._timestamps.get(key), self._errors.get(key))
+                    for key in self._dirty_keys
+                ]
+                statuses = [
+                    (key, homework_id, self._statuses[(key, homework_id)])
+                    for key, homework_id in self._dirty_statuses
+                ]
+                self._dirty_keys.clear()
+                self._dirty_statuses.clear()
+            try:
+                self._write(subscriptions, statuses)
+            except Exception:
+                with self._lock:
+                    self._dirty_keys.update(
+                        key for key, _, _ in subscriptions
+                    )
+                    self._dirty_statuses.update(
+                        (key, homework_id) for key, homework_id, _ in statuses
+                    )
+                raise
+
+    def start(self):
+        """Запускает фоновый сброс изменений раз в flush_interval."""
+        if self._flusher is not None:
+            return
+        self._flusher = threading.Thread(
+            target=self._flush_forever,
+            name='state-store-flush',
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def close(self):
+        """Останавливает фоновый сброс и сохраняет остаток изменений."""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+    def _flush_forever(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as error:
+                logger.error(f'Ошибка при сохранении состояния: {error}')
+
+    def _load(self, subscriptions, statuses):
+        for key, timestamp, error in subscriptions:
+            if timestamp is not None:
+                self._timestamps[key] = timestamp
+            if error is not None:
+                self._errors[key] = error
+        for key, homework_id, status in statuses:
+            self._statuses[(key, homework_id)] = status
+
+    def _write(self, subscriptions, statuses):
+        """Запись изменений на диск. В базовом классе - ничего."""
+
+
+class SQLiteStateStore(StateStore):
+    """Состояние в базе SQLite."""
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS subscriptions ('
+        'key TEXT PRIMARY KEY, timestamp INTEGER, last_error TEXT)',
+        'CREATE TABLE IF NOT EXISTS homework_statuses ('
+        'key TEXT, homework_id TEXT, status TEXT, '
+        'PRIMARY KEY (key, homework_id))',
+    )
+
+    def __init__(self, path, flush_interval=5):
+        """Открывает базу path и загружает состояние в память."""
+        super().__init__(flush_interval=flush_interval)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection_lock = threading.Lock()
+        with self._connection_lock, self._connection:
+            for statement in self.SCHEMA:
+                self._connection.execute(statement)
+            self._load(
+                self._connection.execute(
+                    'SELECT key, timestamp, last_error FROM subscriptions'
+                ),
+                self._connection.execute(
+                    'SELECT key, homework_id, status FROM homework_statuses'
+                ),
+            )
+
+    def get_statuses(self, key):
+        """
+        Пары (id работы, статус) подписки из базы.
+        База общая для шардов, поэтому тут видны и статусы, которые
+        записали другие процессы. Ещё не сброшенные изменения этого
+        процесса берутся из памяти.
+        """
+        with self._flush_lock:
+            with self._connection_lock:
+                statuses = dict(self._connection.execute(
+                    'SELECT homework_id, status FROM homework_statuses '
+                    'WHERE key = ?', (key,)
+                ))
+            with self._lock:
+                statuses.update(
+                    (homework_id, self._statuses[(status_key, homework_id)])
+                    for status_key, homework_id in self._dirty_statuses
+                    if status_key == key
+                )
+        return list(statuses.items())
+
+    def _write(self, subscriptions, statuses):
+        with self._connection_lock, self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO subscriptions '
+                '(key, timestamp, last_error) VALUES (?, ?, ?)',
+                subscriptions,
+            )
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO homework_statuses '
+                '(key, homework_id, status) VALUES (?, ?, ?)',
+                statuses,
+            )
+
+    def close(self):
+        """Сохраняет изменения и закрывает соединение с базой."""
+        super().close()
+        with self._connection_lock:
+            self._connection.close()
+
+
+class JsonStateStore(StateStore):
+    """Состояние в json-файле. Для небольших установок."""
+
+    def __init__(self, path, flush_interval=5):
+        """Загружает состояние из файла path, если он есть."""
+        super().__init__(flush_interval=flush_interval)
+        self.path = path
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                data = json.load(file)
+            self._load(
+                [
+                    (key, value.get('timestamp'), value.get('last_error'))
+                    for key, value in data.get('subscriptions', {}).items()
+                ],
+                [
+                    (key, homework_id, status)
+                    for key, homeworks in data.get('statuses', {}).items()
+                    for homework_id, status in homeworks.items()
+                ],
+            )
+
+    def _write(self, subscriptions, statuses):
+        with self._lock:
+            data = {
+                'subscriptions': {
+                    key: {
+                        'timestamp': self._timestamps.get(key),
+                        'last_error': self._errors.get(key),
+                    }
+                    for key in self._timestamps.keys() | self._errors.keys()
+                },
+                'statuses': {},
+            }
+            for (key, homework_id), status in self._statuses.items():
+                data['statuses'].setdefault(key, {})[homework_id] = status
+        temporary_path = f'{self.path}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(temporary_path, self.path)
+
+
+STATE_BACKENDS = {
+    'sqlite': SQLiteStateStore,
+    'json': JsonStateStore,
+}
+
+
+def open_state_store(backend, path, flush_interval=5):
+    """
+    Открывает хранилище состояния.
+    Без path состояние живёт только в памяти процесса.
+    """
+    if not path:
+        return StateStore(flush_interval=flush_interval)
+    if backend not in STATE_BACKENDS:
+        raise ValueError(
+            f'Неизвестное хранилище состояния \'{backend}\'. '
+            f'Доступны: {", ".join(STATE_BACKENDS)}.'
+        )
+    return STATE_BACKENDS[backend](path, flush_interval=flush_interval)
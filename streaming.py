@@ -0,0 +1,163 @@
+import codecs
+import json
+
+from models import Homework
+
+WHITESPACE = ' \t\n\r'
+
+
+class StreamingStatusParser:
+    """
+    Потоковый разбор ответа homework_statuses.
+    Работы из списка homeworks отдаются по одной записями Homework
+    сразу после декодирования, в памяти держится только недоразобранный хвост.
+    Остальные ключи верхнего уровня (current_date и т.п.)
+    разбираются целиком.
+    """
+
+    def __init__(self):
+        """Разбор с начала ответа."""
+        self.current_date = None
+        self.keys = set()
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._state = 'start'
+        self._key = None
+        self._closed = False
+        self._homeworks = []
+
+    def feed(self, chunk):
+        """Добавляет кусок ответа и возвращает декодированные работы."""
+        if isinstance(chunk, bytes):
+            chunk = self._text.decode(chunk)
+        self._buffer += chunk
+        return self._parse()
+
+    def close(self):
+        """
+        Завершает разбор.
+        Возвращает оставшиеся работы и проверяет, что ответ полный.
+        """
+        self._buffer += self._text.decode(b'', final=True)
+        self._closed = True
+        homeworks = self._parse()
+        if self._state != 'done':
+            raise ValueError('Ответ API оборвался или содержит не json.')
+        for key in ('current_date', 'homeworks'):
+            if key not in self.keys:
+                raise KeyError(f'В словаре response должен быть ключ {key}.')
+        return homeworks
+
+    def _skip_whitespace(self, position):
+        while (
+            position < len(self._buffer)
+            and self._buffer[position] in WHITESPACE
+        ):
+            position += 1
+        return position
+
+    def _decode_value(self, position):
+        """
+        Декодирует значение с позиции position.
+        Возвращает (значение, конец) или None, если данных мало.
+        """
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, position)
+        except json.JSONDecodeError:
+            if self._closed:
+                raise ValueError('Ответ API содержит некорректный json.')
+            return None
+        if end == len(self._buffer) and not self._closed:
+            return None
+        return value, end
+
+    def _parse(self):
+        handlers = {
+            'start': self._parse_start,
+            'key': self._parse_key,
+            'colon': self._parse_colon,
+            'value': self._parse_value,
+            'homeworks': self._parse_homework,
+        }
+        self._homeworks = []
+        position = 0
+        while self._state != 'done':
+            position = self._skip_whitespace(position)
+            if position >= len(self._buffer):
+                break
+            parsed = handlers[self._state](position)
+            if parsed is None:
+                break
+            position = parsed
+        self._buffer = self._buffer[position:]
+        return self._homeworks
+
+    def _parse_start(self, position):
+        if self._buffer[position] != '{':
+            raise TypeError(
+                'Данные должны быть приобразованы из json в словарь.'
+            )
+        self._state = 'key'
+        return position + 1
+
+    def _parse_key(self, position):
+        char = self._buffer[position]
+        if char == '}':
+            self._state = 'done'
+            return position + 1
+        if char == ',':
+            return position + 1
+        decoded = self._decode_value(position)
+        if decoded is None:
+            return None
+        self._key, position = decoded
+        self._state = 'colon'
+        return position
+
+    def _parse_colon(self, position):
+        if self._buffer[position] != ':':
+            raise ValueError('Ответ API содержит некорректный json.')
+        self._state = 'value'
+        return position + 1
+
+    def _parse_value(self, position):
+        self.keys.add(self._key)
+        if self._key == 'homeworks':
+            if self._buffer[position] != '[':
+                raise TypeError('Значением \'homeworks\' должен быть список.')
+            self._state = 'homeworks'
+            return position + 1
+        decoded = self._decode_value(position)
+        if decoded is None:
+            return None
+        value, position = decoded
+        if self._key == 'current_date':
+            self.current_date = value
+        self._state = 'key'
+        return position
+
+    def _parse_homework(self, position):
+        char = self._buffer[position]
+        if char == ']':
+            self._state = 'key'
+            return position + 1
+        if char == ',':
+            return position + 1
+        decoded = self._decode_value(position)
+        if decoded is None:
+            return None
+        homework, position = decoded
+        self._homeworks.append(Homework.from_dict(homework))
+        return position
+
+
+def iter_homeworks(chunks, parser=None):
+    """
+    Отдаёт работы из потока кусков ответа по мере декодирования.
+    После исчерпания current_date доступен в parser.current_date.
+    """
+    parser = parser or StreamingStatusParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
@@ -0,0 +1,62 @@
+import json
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+STRUCTURED_FIELDS = (
+    'token_hash', 'chat_id', 'endpoint', 'status_code', 'latency',
+    'homework_id',
+)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Запись лога одной json-строкой.
+    Кроме времени, уровня и текста в запись попадают поля из extra:
+    token_hash, chat_id, endpoint, status_code, latency, homework_id.
+    """
+
+    def format(self, record):
+        """Json-строка записи лога."""
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'function': record.funcName,
+            'line': record.lineno,
+            'message': record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _PreparedQueueHandler(QueueHandler):
+    """
+    QueueHandler, который не форматирует запись в потоке опроса.
+    Форматирование целиком остаётся фоновому потоку, поэтому
+    аргументы записи не должны меняться после вызова лога.
+    """
+
+    def prepare(self, record):
+        """Запись уходит в очередь как есть."""
+        return record
+
+
+def start_queue_logging(target, *handlers):
+    """
+    Подключает к логгеру target запись через очередь.
+    Обработчики handlers работают в фоновом потоке QueueListener,
+    логгер только кладёт запись в очередь.
+    Возвращает запущенный QueueListener.
+    """
+    records = queue.SimpleQueue()
+    target.addHandler(_PreparedQueueHandler(records))
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+def token_hash(token):
+    """Короткий хэш токена для ключей и логов вместо самого токена."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def subscription_key(token, chat_id):
+    """
+    Ключ подписки для хранилища состояния.
+    Сам токен в хранилище не попадает - только его хэш.
+    """
+    return f'{token_hash(token)}:{chat_id}'
+
+
+class Subscription:
+    """
+    Подписка на статусы домашних работ.
+    Связывает токен Практикума с чатом телеграма
+    и хранит метку from_date для следующего запроса.
+    """
+
+    __slots__ = (
+        'token', 'chat_id', 'key', 'headers', 'timestamp',
+        'schedule', 'paused',
+    )
+
+    def __init__(self, token, chat_id, timestamp=None):
+        """Подписка токена на чат chat_id."""
+        self.token = token
+        self.chat_id = chat_id
+        self.key = subscription_key(token, chat_id)
+        self.headers = {'Authorization': f'OAuth {token}'}
+        self.timestamp = (
+            int(time.time()) if timestamp is None else timestamp
+        )
+        self.schedule = None
+        self.paused = False
+
+    def __repr__(self):
+        """Представление подписки без токена."""
+        return (
+            f'Subscription(chat_id={self.chat_id!r}, '
+            f'timestamp={self.timestamp!r})'
+        )
+
+
+class SubscriptionRegistry:
+    """
+    Реестр подписок: токен -> чат -> подписка.
+    Один токен может быть подписан из нескольких чатов.
+    """
+
+    def __init__(self):
+        """Пустой реестр."""
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def add(self, token, chat_id, timestamp=None):
+        """Добавляет подписку или возвращает уже существующую."""
+        chat_id = str(chat_id)
+        with self._lock:
+            chats = self._subscriptions.setdefault(token, {})
+            if chat_id not in chats:
+                chats[chat_id] = Subscription(token, chat_id, timestamp)
+            return chats[chat_id]
+
+    def remove(self, token, chat_id):
+        """Удаляет подписку, если она есть."""
+        chat_id = str(chat_id)
+        with self._lock:
+            chats = self._subscriptions.get(token, {})
+            subscription = chats.pop(chat_id, None)
+            if not chats:
+                self._subscriptions.pop(token, None)
+            return subscription
+
+    def get(self, token, chat_id):
+        """Возвращает подписку или None."""
+        return self._subscriptions.get(token, {}).get(str(chat_id))
+
+    def for_chat(self, chat_id):
+        """Подписки чата."""
+        chat_id = str(chat_id)
+        with self._lock:
+            return [
+                chats[chat_id]
+                for chats in self._subscriptions.values()
+                if chat_id in chats
+            ]
+
+    def tokens(self):
+        """Список уникальных токенов реестра."""
+        with self._lock:
+            return list(self._subscriptions)
+
+    def snapshot(self):
+        """Список подписок на момент вызова."""
+        with self._lock:
+            return [
+                subscription
+                for chats in self._subscriptions.values()
+                for subscription in chats.values()
+            ]
+
+    def __iter__(self):
+        """Перебор подписок на момент вызова."""
+        return iter(self.snapshot())
+
+    def __len__(self):
+        """Число подписок."""
+        with self._lock:
+            return sum(len(chats) for chats in self._subscriptions.values())
+
+    @classmethod
+    def from_file(cls, path, timestamp=None):
+        """
+        Загружает реестр из json-файла.
+        Формат: [{"token": "...", "chat_id": "...", "paused": false}, ...],
+        ключ paused необязателен.
+        """
+        registry = cls()
+        with open(path, encoding='utf-8') as file:
+            entries = json.load(file)
+        if not isinstance(entries, list):
+            raise TypeError(
+                f'Файл подписок {path} должен содержать список.'
+            )
+        for entry in entries:
+            if 'token' not in entry or 'chat_id' not in entry:
+                raise KeyError(
+                    f'В подписке из файла {path} нет ключа '
+                    '\'token\' или \'chat_id\'.'
+                )
+            subscription = registry.add(
+                entry['token'], entry['chat_id'], timestamp
+            )
+            subscription.paused = bool(entry.get('paused', False))
+        return registry
+
+    def to_file(self, path):
+        """Сохраняет реестр в json-файл в формате from_file."""
+        entries = []
+        for subscription in self.snapshot():
+            entry = {
+                'token': subscription.token, 'chat_id': subscription.chat_id,
+            }
+            if subscription.paused:
+                entry['paused'] = True
+            entries.append(entry)
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(entries, file, ensure_ascii=False, indent=2)
+        os.replace(temporary, path)
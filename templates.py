@@ -0,0 +1,86 @@
+import json
+
+
+DEFAULT_MESSAGE = (
+    'Изменился статус проверки работы "{homework_name}". {verdict}'
+)
+
+
+class _Fields(dict):
+    """Поля работы для подстановки: отсутствующие поля пустые."""
+
+    def __missing__(self, key):
+        return ''
+
+
+class MessageTemplates:
+    """
+    Реестр шаблонов сообщений о статусе работы.
+    Шаблоны собираются один раз при запуске: вердикт подставляется
+    заранее, поэтому форматирование - это один поиск в словаре
+    и одна подстановка полей работы.
+    """
+
+    def __init__(self, default_locale='ru'):
+        """Пустой реестр с языком по умолчанию default_locale."""
+        self.default_locale = default_locale
+        self._templates = {}
+        self._verdicts = {}
+        self._messages = {}
+        self._optional = {}
+
+    def add_locale(self, locale, verdicts, message=None, optional=None):
+        """
+        Добавляет статусы локали и пересобирает её шаблоны.
+        verdicts - тексты вердиктов по статусам; optional - фрагменты,
+        которые добавляются, только если в работе есть такое поле.
+        """
+        self._verdicts.setdefault(locale, {}).update(verdicts)
+        if message is not None:
+            self._messages[locale] = message
+        if optional is not None:
+            self._optional[locale] = tuple(optional.items())
+        message = self._messages.get(locale, DEFAULT_MESSAGE)
+        self._templates[locale] = {
+            status: message.replace(
+                '{verdict}', verdict.replace('{', '{{').replace('}', '}}')
+            )
+            for status, verdict in self._verdicts[locale].items()
+        }
+
+    def statuses(self, locale=None):
+        """Статусы, для которых есть шаблоны."""
+        return set(self._templates.get(locale or self.default_locale, ()))
+
+    def render(self, homework, locale=None):
+        """Текст сообщения о статусе работы."""
+        locale = locale or self.default_locale
+        status = homework['status']
+        template = self._templates.get(locale, {}).get(status)
+        if template is None and locale != self.default_locale:
+            return self.render(homework, self.default_locale)
+        if template is None:
+            raise KeyError(f'Нет шаблона сообщения для статуса \'{status}\'.')
+        fields = _Fields(homework)
+        text = template.format_map(fields)
+        for field, fragment in self._optional.get(locale, ()):
+            if fields.get(field):
+                text += fragment.format_map(fields)
+        return text
+
+    def load(self, path):
+        """
+        Дополняет реестр шаблонами из json-файла.
+        Формат: {"ru": {"message": "...", "verdicts": {...},
+        "optional": {...}}}.
+        """
+        with open(path, encoding='utf-8') as file:
+            locales = json.load(file)
+        for locale, config in locales.items():
+            self.add_locale(
+                locale,
+                verdicts=config.get('verdicts', {}),
+                message=config.get('message'),
+                optional=config.get('optional'),
+            )
+        return self
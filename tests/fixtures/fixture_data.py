@@ -23,6 +23,26 @@ def homework_module():
     return homework
 
 
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    """Каждый тест начинает с пустого состояния бота."""
+    import homework
+    store = homework.StateStore()
+    monkeypatch.setattr(homework, 'state_store', store)
+    monkeypatch.setattr(homework, 'status_diff', homework.StatusDiff(store))
+    for name in ('practicum_breaker', 'telegram_breaker'):
+        breaker = getattr(homework, name)
+        monkeypatch.setattr(homework, name, homework.CircuitBreaker(
+            breaker.name,
+            failure_threshold=breaker.failure_threshold,
+            probe_interval=breaker.probe_interval,
+        ))
+    monkeypatch.setattr(
+        homework, 'error_aggregator', homework.ErrorAggregator()
+    )
+    return store
+
+
 @pytest.fixture
 def random_message():
     def random_string(string_length=15):
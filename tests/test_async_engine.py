@@ -0,0 +1,67 @@
+import asyncio
+
+import requests
+import utils
+
+from subscriptions import SubscriptionRegistry
+
+
+def mock_get(data):
+    def mocked_response(*args, **kwargs):
+        return utils.MockResponseGET(*args, data=data, **kwargs)
+    return mocked_response
+
+
+def run_poll(homework_module, bot, registry):
+    async def poll():
+        semaphore = asyncio.Semaphore(2)
+        await asyncio.gather(*(
+            homework_module.async_poll_subscription(
+                bot, subscription, semaphore
+            )
+            for subscription in registry.snapshot()
+        ))
+    asyncio.run(poll())
+
+
+class TestAsyncEngine:
+
+    def test_async_get_api_answer(self, monkeypatch, homework_module,
+                                  data_with_new_hw_status):
+        monkeypatch.setattr(
+            requests, 'get', mock_get(data_with_new_hw_status)
+        )
+        result = asyncio.run(homework_module.async_get_api_answer(0))
+        assert result == data_with_new_hw_status
+
+    def test_poll_sends_to_subscription_chat(self, monkeypatch,
+                                             homework_module,
+                                             data_with_new_hw_status):
+        monkeypatch.setattr(
+            requests, 'get', mock_get(data_with_new_hw_status)
+        )
+        bot = utils.MockTelegramBot()
+        registry = SubscriptionRegistry()
+        subscription = registry.add('token', 42, timestamp=0)
+        run_poll(homework_module, bot, registry)
+        assert bot.chat_id == '42'
+        assert 'hw123' in bot.text
+        assert subscription.timestamp == (
+            data_with_new_hw_status['current_date']
+        )
+
+    def test_poll_error_is_reported_once(self, monkeypatch,
+                                         homework_module):
+        monkeypatch.setattr(requests, 'get', mock_get([]))
+        sent = []
+
+        class Bot(utils.MockTelegramBot):
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                sent.append(text)
+
+        registry = SubscriptionRegistry()
+        subscription = registry.add('token', 42, timestamp=0)
+        run_poll(homework_module, Bot(), registry)
+        run_poll(homework_module, Bot(), registry)
+        assert len(sent) == 1
+        assert subscription.timestamp == 0
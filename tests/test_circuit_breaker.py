@@ -0,0 +1,119 @@
+import pytest
+import requests
+import telegram
+
+import utils
+from circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError,
+)
+from retry import RetryPolicy
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker('api', failure_threshold=2,
+                                 probe_interval=10, clock=Clock())
+        breaker.record_failure()
+        assert breaker.state == CLOSED and breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker('api', failure_threshold=2, clock=Clock())
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+    def test_single_probe_after_interval(self):
+        clock = Clock()
+        breaker = CircuitBreaker('api', failure_threshold=1,
+                                 probe_interval=10, clock=clock)
+        breaker.record_failure()
+        assert breaker.retry_after() == 10
+        clock.now = 10
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        clock.now = 20
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.allow() and breaker.allow()
+
+
+class TestUpstreamBreakers:
+
+    @pytest.fixture(autouse=True)
+    def no_retries(self, monkeypatch, homework_module):
+        monkeypatch.setattr(
+            homework_module, 'api_retry_policy', RetryPolicy(attempts=1)
+        )
+
+    def test_api_is_not_called_while_open(self, monkeypatch,
+                                          homework_module):
+        calls = []
+
+        def get(*args, **kwargs):
+            calls.append(1)
+            raise requests.ConnectionError('down')
+
+        monkeypatch.setattr(requests, 'get', get)
+        breaker = homework_module.practicum_breaker
+        for _ in range(breaker.failure_threshold + 3):
+            with pytest.raises(ConnectionError):
+                homework_module.get_api_answer(0)
+        assert len(calls) == breaker.failure_threshold
+        assert breaker.state == OPEN
+
+    def test_server_errors_open_the_circuit(self, monkeypatch,
+                                            homework_module):
+        def get(*args, **kwargs):
+            response = utils.MockResponseGET(*args, **kwargs)
+            response.status_code = 503
+            return response
+
+        monkeypatch.setattr(requests, 'get', get)
+        breaker = homework_module.practicum_breaker
+        for _ in range(breaker.failure_threshold):
+            with pytest.raises(ValueError):
+                homework_module.get_api_answer(0)
+        with pytest.raises(CircuitOpenError):
+            homework_module.get_api_answer(0)
+
+    def test_telegram_outage_skips_sending(self, homework_module):
+        sent = []
+
+        class Bot:
+            def send_message(self, chat_id=None, text=None):
+                sent.append(text)
+                raise telegram.error.NetworkError('down')
+
+        breaker = homework_module.telegram_breaker
+        for _ in range(breaker.failure_threshold + 2):
+            homework_module.send_message(Bot(), 'text')
+        assert len(sent) == breaker.failure_threshold
+
+    def test_bad_request_is_not_an_outage(self, homework_module):
+        class Bot:
+            def send_message(self, chat_id=None, text=None):
+                raise telegram.error.BadRequest('chat not found')
+
+        for _ in range(homework_module.telegram_breaker.failure_threshold):
+            homework_module.send_message(Bot(), 'text')
+        assert homework_module.telegram_breaker.state == CLOSED
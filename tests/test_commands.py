@@ -0,0 +1,146 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from commands import CommandHandler
+from status_diff import StatusDiff
+from subscriptions import SubscriptionRegistry
+
+VERDICTS = {'approved': 'Работа проверена: ревьюеру всё понравилось.'}
+
+
+@pytest.fixture
+def handler():
+    registry = SubscriptionRegistry()
+    subscribed = []
+    handler = CommandHandler(
+        registry, StatusDiff(), VERDICTS, on_subscribe=subscribed.append
+    )
+    handler.subscribed = subscribed
+    return handler
+
+
+class TestCommandHandler:
+
+    def test_not_a_command(self, handler):
+        assert handler.handle(1, 'привет') is None
+        assert handler.handle(1, None) is None
+        assert 'Неизвестная команда /foo' in handler.handle(1, '/foo')
+
+    def test_subscribe(self, handler):
+        assert 'Использование' in handler.handle(1, '/subscribe')
+        assert 'подписан' in handler.handle(1, '/subscribe token')
+        assert 'уже подписан' in handler.handle(1, '/subscribe@bot token')
+        assert [sub.chat_id for sub in handler.subscribed] == ['1']
+        assert handler.registry.get('token', 1) is not None
+
+    def test_status_is_answered_from_memory(self, handler):
+        assert 'не подписан' in handler.handle(1, '/status')
+        handler.handle(1, '/subscribe token')
+        assert 'не было' in handler.handle(1, '/status')
+        subscription = handler.registry.get('token', 1)
+        handler.status_diff.record(subscription.key, [
+            {'id': 5, 'homework_name': 'hw5', 'status': 'approved'},
+        ])
+        assert handler.handle(1, '/status') == (
+            '"hw5": Работа проверена: ревьюеру всё понравилось.'
+        )
+
+    def test_pause_toggles(self, handler):
+        handler.handle(1, '/subscribe token')
+        subscription = handler.registry.get('token', 1)
+        assert 'приостановлены' in handler.handle(1, '/pause')
+        assert subscription.paused
+        assert 'возобновлены' in handler.handle(1, '/pause')
+        assert not subscription.paused
+
+
+class TestCommandUpdates:
+
+    def test_replies_to_updates(self, homework_module, handler):
+        class Stop(Exception):
+            pass
+
+        class Bot:
+            def __init__(self):
+                self.offsets = []
+                self.sent = []
+
+            def get_updates(self, offset=None, **kwargs):
+                self.offsets.append(offset)
+                if len(self.offsets) > 1:
+                    raise Stop()
+                return [SimpleNamespace(
+                    update_id=10,
+                    effective_message=SimpleNamespace(
+                        chat_id=1, text='/subscribe token'
+                    ),
+                )]
+
+            def send_message(self, chat_id=None, text=None):
+                self.sent.append((chat_id, text))
+
+        bot = Bot()
+        with pytest.raises(Stop):
+            asyncio.run(homework_module.async_handle_commands(bot, handler))
+        assert bot.offsets == [None, 11]
+        assert bot.sent and bot.sent[0][0] == 1
+        assert handler.registry.get('token', 1) is not None
+
+    def test_failed_command_does_not_stop_updates(self, homework_module,
+                                                  handler, caplog):
+        class Stop(Exception):
+            pass
+
+        class Bot:
+            def __init__(self):
+                self.offsets = []
+                self.sent = []
+
+            def get_updates(self, offset=None, **kwargs):
+                self.offsets.append(offset)
+                if len(self.offsets) > 1:
+                    raise Stop()
+                return [
+                    SimpleNamespace(
+                        update_id=update_id,
+                        effective_message=SimpleNamespace(
+                            chat_id=chat_id, text='/subscribe token'
+                        ),
+                    )
+                    for update_id, chat_id in ((10, 1), (11, 2))
+                ]
+
+            def send_message(self, chat_id=None, text=None):
+                self.sent.append((chat_id, text))
+
+        def on_subscribe(subscription):
+            if subscription.chat_id == '1':
+                raise OSError('disk full')
+
+        handler.on_subscribe = on_subscribe
+        bot = Bot()
+        with pytest.raises(Stop):
+            asyncio.run(homework_module.async_handle_commands(bot, handler))
+        assert bot.offsets == [None, 12]
+        assert [chat_id for chat_id, _ in bot.sent] == [2]
+        assert 'disk full' in caplog.text
+
+    def test_failed_save_is_logged(self, monkeypatch, tmp_path,
+                                   homework_module, caplog):
+        monkeypatch.setattr(
+            homework_module, 'SUBSCRIPTIONS_FILE',
+            str(tmp_path / 'missing' / 'subscriptions.json')
+        )
+        handler = homework_module.make_command_handler(
+            None, SubscriptionRegistry(), None
+        )
+
+        async def subscribe():
+            reply = handler.handle(1, '/subscribe token')
+            await asyncio.gather(*homework_module.subscription_saves)
+            return reply
+
+        assert 'подписан' in asyncio.run(subscribe())
+        assert 'Не удалось сохранить подписку' in caplog.text
@@ -0,0 +1,74 @@
+from error_aggregator import ErrorAggregator, fingerprint
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_error(error_type, text):
+    try:
+        try:
+            raise OSError('cause')
+        except OSError as cause:
+            raise error_type(text) from cause
+    except error_type as error:
+        return error
+
+
+class TestErrorAggregator:
+
+    def test_fingerprint_ignores_numbers(self):
+        first = make_error(ValueError, "Ошибка 500\nfrom_date: 1")
+        second = make_error(ValueError, "Ошибка 502\nfrom_date: 2")
+        assert fingerprint(first) == fingerprint(second)
+        assert fingerprint(first) != fingerprint(ConnectionError('x'))
+
+    def test_alternating_errors_are_sent_once(self):
+        aggregator = ErrorAggregator(clock=Clock())
+        server_error = ValueError('статус код 500')
+        timeout = ConnectionError('timeout')
+        notices = [
+            aggregator.record_error('chat', error)
+            for error in (server_error, timeout, server_error, timeout)
+        ]
+        assert [bool(notice) for notice in notices] == [
+            True, True, False, False
+        ]
+        assert 'статус код 500' in notices[0]
+
+    def test_summary_and_recovery(self):
+        clock = Clock()
+        aggregator = ErrorAggregator(notify_interval=3600,
+                                     summary_interval=1800, clock=clock)
+        error = ConnectionError('недоступен')
+        assert aggregator.record_error('chat', error)
+        for minute in range(1, 30):
+            clock.now = minute * 60
+            assert aggregator.record_error('chat', error) is None
+        clock.now = 42 * 60
+        summary = aggregator.record_error('chat', error)
+        assert 'уже 42 мин' in summary and 'ошибок: 31' in summary
+        clock.now = 43 * 60
+        recovery = aggregator.record_success('chat')
+        assert 'восстановлена после 43 мин' in recovery
+        assert aggregator.record_success('chat') is None
+
+    def test_restored_notice_is_not_repeated(self):
+        aggregator = ErrorAggregator(clock=Clock())
+        error = ConnectionError('недоступен')
+        aggregator.restore('chat', f'Сбой в работе программы: {error}')
+        assert aggregator.record_error('chat', error) is None
+        assert aggregator.record_success('chat')
+
+    def test_error_state_is_persisted(self, homework_module):
+        error = ConnectionError('недоступен')
+        notice = homework_module.report_error('chat', error)
+        assert homework_module.state_store.get_error('chat') == notice
+        assert homework_module.report_error('chat', error) is None
+        assert 'восстановлена' in homework_module.report_recovery('chat')
+        assert homework_module.state_store.get_error('chat') is None
@@ -0,0 +1,62 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import http_client
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}/'
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpClient:
+
+    def test_fallback_to_requests_get(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            requests, 'get', lambda url, **kwargs: calls.append(kwargs)
+        )
+        http_client.close_session()
+        http_client.http_get('http://example.com', timeout=(1, 2))
+        assert calls == [{'timeout': (1, 2)}]
+
+    def test_keep_alive_reuses_connection(self, local_server):
+        session = http_client.configure_session(
+            pool_connections=1, pool_maxsize=2,
+            connect_timeout=1, read_timeout=1,
+        )
+        try:
+            for _ in range(4):
+                response = http_client.http_get(local_server)
+                assert response.json() == {}
+            stats = http_client.pool_stats()
+            assert stats['requests'] == 4
+            assert stats['connections'] == 1
+            assert stats['hit_rate'] == pytest.approx(0.75)
+            assert session.timeout == (1, 1)
+        finally:
+            http_client.close_session()
+        assert http_client.pool_stats() is None
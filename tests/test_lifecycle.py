@@ -0,0 +1,113 @@
+import asyncio
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from lifecycle import Lifecycle, ShutdownRequested
+from storage import SQLiteStateStore
+from subscriptions import SubscriptionRegistry
+
+
+@pytest.fixture
+def lifecycle():
+    handlers = {
+        signum: signal.getsignal(signum)
+        for signum in (signal.SIGTERM, signal.SIGINT)
+    }
+    lifecycle = Lifecycle(deadline=60)
+    yield lifecycle
+    lifecycle.close()
+    for signum, handler in handlers.items():
+        signal.signal(signum, handler)
+
+
+def send_signal(signum, delay=0.05):
+    threading.Timer(delay, os.kill, (os.getpid(), signum)).start()
+
+
+class TestLifecycle:
+
+    def test_signal_interrupts_sleep(self, lifecycle):
+        lifecycle.install()
+        started = time.monotonic()
+        send_signal(signal.SIGTERM)
+        with pytest.raises(ShutdownRequested):
+            with lifecycle.interruptible():
+                time.sleep(5)
+        assert time.monotonic() - started < 1
+        assert lifecycle.stopping.is_set()
+        assert 0 < lifecycle.remaining() <= 60
+
+    def test_signal_does_not_interrupt_work(self, lifecycle):
+        lifecycle.install()
+        send_signal(signal.SIGINT, delay=0)
+        time.sleep(0.1)
+        assert lifecycle.stopping.is_set()
+        with pytest.raises(ShutdownRequested):
+            with lifecycle.interruptible():
+                time.sleep(5)
+
+    def test_async_signal_cancels_watchers(self, lifecycle):
+        async def run():
+            loop = asyncio.get_running_loop()
+            watcher = asyncio.ensure_future(asyncio.sleep(5))
+            lifecycle.install_async(loop, watcher.cancel)
+            send_signal(signal.SIGTERM)
+            with pytest.raises(asyncio.CancelledError):
+                await watcher
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                loop.remove_signal_handler(signum)
+
+        asyncio.run(run())
+        assert lifecycle.stopping.is_set()
+
+    def test_main_saves_state_when_stopped(self, monkeypatch, fresh_state,
+                                           homework_module):
+        monkeypatch.setattr(homework_module, 'lifecycle', Lifecycle(60))
+        monkeypatch.setattr(homework_module, 'check_tokens', lambda: None)
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(
+            homework_module, 'request_homework_statuses',
+            lambda timestamp, headers: {'homeworks': [], 'current_date': 42}
+        )
+        homework_module.lifecycle.request_stop()
+        with pytest.raises(ShutdownRequested):
+            homework_module.main()
+        homework_module.lifecycle.close()
+        key = homework_module.subscription_key(
+            homework_module.PRACTICUM_TOKEN, homework_module.TELEGRAM_CHAT_ID
+        )
+        assert fresh_state.get_timestamp(key) == 42
+
+    def test_async_main_flushes_state_before_returning(
+            self, monkeypatch, lifecycle, tmp_path, homework_module):
+        path = str(tmp_path / 'state.sqlite3')
+        store = SQLiteStateStore(path, flush_interval=60)
+        registry = SubscriptionRegistry()
+        subscription = registry.add('token', 1, timestamp=0)
+        monkeypatch.setattr(homework_module, 'state_store', store)
+        monkeypatch.setattr(homework_module, 'lifecycle', lifecycle)
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework_module, 'load_registry', lambda: registry)
+        monkeypatch.setattr(homework_module, 'outbox', None)
+        monkeypatch.setattr(
+            homework_module, 'request_homework_statuses',
+            lambda timestamp, headers: {'homeworks': [], 'current_date': 42}
+        )
+
+        async def run():
+            send_signal(signal.SIGTERM, delay=0.2)
+            await homework_module.async_main()
+            restored = SQLiteStateStore(path)
+            try:
+                return restored.get_timestamp(subscription.key)
+            finally:
+                restored.close()
+
+        try:
+            assert asyncio.run(run()) == 42
+        finally:
+            store.close()
@@ -0,0 +1,137 @@
+import json
+import logging
+import sys
+
+import pytest
+import utils
+
+from structured_logging import JsonFormatter, start_queue_logging
+
+
+@pytest.fixture
+def logger_level(homework_module):
+    level = homework_module.logger.level
+    yield homework_module.logger.setLevel
+    homework_module.logger.setLevel(level)
+
+
+@pytest.fixture
+def restore_logging(homework_module):
+    loggers = [logging.getLogger()] + [
+        logging.getLogger(name) for name in homework_module.LIBRARY_LOGGERS
+    ]
+    levels = [item.level for item in loggers]
+    handlers = list(logging.getLogger().handlers)
+    yield
+    homework_module.log_listener.stop()
+    logging.getLogger().handlers[:] = handlers
+    for item, level in zip(loggers, levels):
+        item.setLevel(level)
+    homework_module.logger.addHandler(homework_module.handler)
+
+
+class CountingStr(str):
+    formatted = 0
+
+    def __str__(self):
+        CountingStr.formatted += 1
+        return super().__str__()
+
+
+class TestLazyLogging:
+
+    def test_debug_messages_are_not_built_at_info(self, logger_level,
+                                                  homework_module):
+        logger_level(logging.INFO)
+        CountingStr.formatted = 0
+        bot = utils.MockTelegramBot()
+        homework_module.send_message_to_chat(bot, '1', CountingStr('text'))
+        assert bot.text == 'text'
+        assert CountingStr.formatted == 0
+
+    def test_debug_messages_are_built_at_debug(self, logger_level, caplog,
+                                               homework_module):
+        logger_level(logging.DEBUG)
+        with caplog.at_level(logging.DEBUG):
+            homework_module.send_message_to_chat(
+                utils.MockTelegramBot(), '1', 'text'
+            )
+        assert any(
+            record.getMessage() == (
+                'Сообщение "text" успешно отправлено в чат телеграма 1'
+            )
+            for record in caplog.records
+        )
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(self.format(record))
+
+
+class TestStructuredLogging:
+
+    def test_json_formatter_includes_extra_fields(self):
+        record = logging.LogRecord(
+            'homework', logging.INFO, __file__, 10,
+            'Запрос %s выполнен', ('GET',), None
+        )
+        record.token_hash = 'abc'
+        record.status_code = 200
+        record.latency = 0.25
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry['message'] == 'Запрос GET выполнен'
+        assert entry['level'] == 'INFO'
+        assert entry['token_hash'] == 'abc'
+        assert entry['status_code'] == 200
+        assert entry['latency'] == 0.25
+        assert 'chat_id' not in entry
+
+    def test_json_formatter_includes_exception(self):
+        try:
+            raise ValueError('сбой')
+        except ValueError:
+            record = logging.LogRecord(
+                'homework', logging.ERROR, __file__, 10, 'Ошибка', (),
+                sys.exc_info()
+            )
+        entry = json.loads(JsonFormatter().format(record))
+        assert 'ValueError: сбой' in entry['exception']
+
+    def test_queue_logging_delivers_records_in_background(self):
+        target = logging.getLogger('test_structured_logging')
+        target.propagate = False
+        output = ListHandler()
+        output.setFormatter(JsonFormatter())
+        listener = start_queue_logging(target, output)
+        try:
+            target.warning('Чат %s', 1, extra={'chat_id': 1})
+        finally:
+            listener.stop()
+            target.handlers.clear()
+        entry = json.loads(output.records[0])
+        assert entry['message'] == 'Чат 1'
+        assert entry['chat_id'] == 1
+
+    def test_send_message_logs_chat_id(self, logger_level, caplog,
+                                       homework_module):
+        logger_level(logging.DEBUG)
+        with caplog.at_level(logging.DEBUG):
+            homework_module.send_message_to_chat(
+                utils.MockTelegramBot(), '1', 'text'
+            )
+        assert caplog.records
+        assert all(record.chat_id == '1' for record in caplog.records)
+
+    def test_module_info_records_pass_root(self, monkeypatch,
+                                           restore_logging, homework_module):
+        monkeypatch.setattr(homework_module, 'LOG_LEVEL', 'INFO')
+        homework_module.setup_logging()
+        assert logging.getLogger('lifecycle').isEnabledFor(logging.INFO)
+        assert not logging.getLogger('lifecycle').isEnabledFor(logging.DEBUG)
+        assert not logging.getLogger('urllib3').isEnabledFor(logging.INFO)
@@ -0,0 +1,88 @@
+import pytest
+import requests
+import utils
+
+from metrics import MetricsRegistry, start_metrics_server
+
+
+class TestMetrics:
+
+    def test_counter_and_render(self):
+        registry = MetricsRegistry()
+        counter = registry.counter('errors_total', 'Ошибки.', ('error',))
+        counter.inc(error='KeyError')
+        counter.inc(2, error='KeyError')
+        assert counter.value(error='KeyError') == 3
+        assert 'errors_total{error="KeyError"} 3.0' in registry.render()
+        with pytest.raises(ValueError):
+            counter.inc(status='200')
+        with pytest.raises(ValueError):
+            registry.counter('errors_total', 'Повтор.')
+
+    def test_count_exceptions(self):
+        counter = MetricsRegistry().counter('failures', 'Сбои.', ('error',))
+
+        @counter.count_exceptions()
+        def broken():
+            """Всегда падает."""
+            raise TypeError('boom')
+
+        with pytest.raises(TypeError):
+            broken()
+        assert counter.value(error='TypeError') == 1
+        assert broken.__doc__ == 'Всегда падает.'
+
+    def test_histogram(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram(
+            'latency_seconds', 'Задержка.', ('loop',), buckets=(0.1, 1)
+        )
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value, loop='main')
+        text = registry.render()
+        assert 'latency_seconds_bucket{loop="main",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{loop="main",le="1.0"} 2' in text
+        assert 'latency_seconds_bucket{loop="main",le="+Inf"} 3' in text
+        assert 'latency_seconds_count{loop="main"} 3' in text
+
+    def test_metrics_endpoint(self):
+        registry = MetricsRegistry()
+        registry.gauge_function('answer', 'Ответ.', lambda: 42)
+        server = start_metrics_server(0, '127.0.0.1', registry)
+        try:
+            url = f'http://127.0.0.1:{server.server_address[1]}'
+            response = requests.get(f'{url}/metrics', timeout=1)
+            missing = requests.get(f'{url}/other', timeout=1)
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert 'answer 42.0' in response.text
+        assert missing.status_code == 404
+
+    def test_hot_paths_are_instrumented(self, monkeypatch, homework_module,
+                                        data_with_new_hw_status):
+        def mock_get(*args, **kwargs):
+            return utils.MockResponseGET(data=data_with_new_hw_status)
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        requests_before = homework_module.API_REQUEST_SECONDS.count(
+            status='200'
+        )
+        approved_before = homework_module.PARSE_STATUS_TOTAL.value(
+            status='approved'
+        )
+        homeworks = homework_module.check_response(
+            homework_module.get_api_answer(0)
+        )
+        homework_module.parse_status(homeworks[0])
+        assert homework_module.API_REQUEST_SECONDS.count(
+            status='200'
+        ) == requests_before + 1
+        assert homework_module.PARSE_STATUS_TOTAL.value(
+            status='approved'
+        ) == approved_before + 1
+        with pytest.raises(TypeError):
+            homework_module.check_response([])
+        assert homework_module.CHECK_RESPONSE_FAILURES.value(
+            error='TypeError'
+        ) >= 1
@@ -0,0 +1,66 @@
+import pytest
+
+from models import Homework, StatusResponse
+
+RAW = {
+    'id': 123,
+    'status': 'approved',
+    'homework_name': 'username__hw_python_oop.zip',
+    'reviewer_comment': 'Всё нравится',
+    'date_updated': '2020-02-13T14:40:57Z',
+    'lesson_name': 'Итоговый проект',
+    'user': 'username',
+    'lesson': 7,
+}
+
+
+class TestHomework:
+
+    def test_keeps_only_used_fields(self):
+        homework = Homework.from_dict(RAW)
+        assert not hasattr(homework, '__dict__')
+        assert not hasattr(homework, 'user')
+        assert 'user' not in homework
+        assert homework.key == 123
+        assert dict(homework) == {
+            field: value for field, value in RAW.items()
+            if field not in ('user', 'lesson')
+        }
+
+    def test_dict_like_access(self):
+        homework = Homework.from_dict({'homework_name': 'hw', 'status': 'x'})
+        assert homework['status'] == 'x'
+        assert homework.get('id', 'default') == 'default'
+        assert homework.key == 'hw'
+        assert 'id' not in homework
+        with pytest.raises(KeyError):
+            homework['reviewer_comment']
+
+    def test_not_a_dict(self):
+        with pytest.raises(TypeError):
+            Homework.from_dict(['hw'])
+
+
+class TestStatusResponse:
+
+    def test_from_dict(self):
+        response = StatusResponse.from_dict(
+            {'homeworks': [RAW], 'current_date': 1}
+        )
+        assert response.current_date == 1
+        assert response.homeworks == [Homework.from_dict(RAW)]
+
+    @pytest.mark.parametrize('data, error', [
+        ([], TypeError),
+        ({'homeworks': []}, KeyError),
+        ({'current_date': 1}, KeyError),
+        ({'homeworks': {}, 'current_date': 1}, TypeError),
+        ({'homeworks': [1], 'current_date': 1}, TypeError),
+    ])
+    def test_invalid(self, data, error):
+        with pytest.raises(error):
+            StatusResponse.from_dict(data)
+
+    def test_parse_status_accepts_homework(self, homework_module):
+        message = homework_module.parse_status(Homework.from_dict(RAW))
+        assert 'username__hw_python_oop.zip' in message
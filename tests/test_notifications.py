@@ -0,0 +1,33 @@
+class TestBatchNotifications:
+
+    HOMEWORKS = [
+        {'id': 2, 'homework_name': 'hw2', 'status': 'approved',
+         'date_updated': '2020-02-14T10:00:00Z'},
+        {'id': 1, 'homework_name': 'hw1', 'status': 'reviewing',
+         'date_updated': '2020-02-13T10:00:00Z'},
+        {'id': 2, 'homework_name': 'hw2', 'status': 'approved',
+         'date_updated': '2020-02-14T10:00:00Z'},
+        {'id': 1, 'homework_name': 'hw1', 'status': 'rejected',
+         'date_updated': '2020-02-13T12:00:00Z'},
+    ]
+
+    def test_parse_statuses_dedup_and_order(self, homework_module):
+        messages = homework_module.parse_statuses(self.HOMEWORKS)
+        assert len(messages) == 3
+        assert '"hw1"' in messages[0] and 'на проверку' in messages[0]
+        assert '"hw1"' in messages[1] and 'замечания' in messages[1]
+        assert '"hw2"' in messages[2]
+
+    def test_parse_statuses_skips_unknown_status(self, homework_module):
+        homeworks = self.HOMEWORKS + [
+            {'id': 3, 'homework_name': 'hw3', 'status': 'unknown'},
+        ]
+        messages = homework_module.parse_statuses(homeworks)
+        assert len(messages) == 3
+        assert not any('"hw3"' in message for message in messages)
+
+    def test_combined_notification(self, monkeypatch, homework_module):
+        monkeypatch.setattr(homework_module, 'COMBINE_NOTIFICATIONS', True)
+        messages = homework_module.build_notifications(self.HOMEWORKS)
+        assert len(messages) == 1
+        assert messages[0].count('Изменился статус') == 3
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import telegram
+
+from circuit_breaker import CircuitBreaker
+from outbox import Outbox, TokenBucket, join_messages
+
+
+class RecordingBot:
+
+    def __init__(self, fail_first=None):
+        self.sent = []
+        self.fail_first = fail_first
+        self.lock = threading.Lock()
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        with self.lock:
+            if self.fail_first is not None:
+                error, self.fail_first = self.fail_first, None
+                raise error
+            self.sent.append((chat_id, text))
+
+
+class TestOutbox:
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert 0 < bucket.reserve() <= 0.1
+
+    def test_join_messages_respects_limit(self):
+        joined = join_messages(['a' * 6] * 3, limit=14)
+        assert joined == ['a' * 6 + '\n\n' + 'a' * 6, 'a' * 6]
+
+    def test_pending_messages_are_coalesced(self):
+        bot = RecordingBot()
+        outbox = Outbox(bot, workers=2, chat_rate=100)
+        for number in range(3):
+            outbox.put('1', f'message {number}')
+        outbox.put('2', 'other chat')
+        outbox.start()
+        assert outbox.close(timeout=1) == 0
+        assert sorted(bot.sent) == [
+            ('1', 'message 0\n\nmessage 1\n\nmessage 2'),
+            ('2', 'other chat'),
+        ]
+        assert outbox.coalesced == 2
+        assert outbox.sent == 2
+
+    def test_retry_after_is_honored(self):
+        bot = RecordingBot(fail_first=telegram.error.RetryAfter(0.2))
+        outbox = Outbox(bot, workers=1, chat_rate=100).start()
+        started = time.monotonic()
+        outbox.put('1', 'text')
+        assert outbox.close(timeout=1) == 0
+        assert time.monotonic() - started >= 0.2
+        assert bot.sent == [('1', 'text')]
+        assert outbox.retried == 1
+
+    def test_chat_rate_limit(self):
+        bot = RecordingBot()
+        outbox = Outbox(bot, workers=2, chat_rate=5).start()
+        started = time.monotonic()
+        outbox.put('1', 'first')
+        time.sleep(0.05)
+        outbox.put('1', 'second')
+        outbox.close(timeout=1)
+        assert [text for _, text in bot.sent] == ['first', 'second']
+        assert time.monotonic() - started >= 0.2
+
+    def test_telegram_error_does_not_stop_worker(self):
+        bot = RecordingBot(fail_first=telegram.TelegramError('boom'))
+        outbox = Outbox(bot, workers=1, chat_rate=100).start()
+        outbox.put('1', 'lost')
+        outbox.put('2', 'delivered')
+        assert outbox.close(timeout=1) == 0
+        assert bot.sent == [('2', 'delivered')]
+
+    def test_open_circuit_holds_messages(self):
+        bot = RecordingBot()
+        breaker = CircuitBreaker('telegram', failure_threshold=1,
+                                 probe_interval=60)
+        breaker.record_failure()
+        outbox = Outbox(bot, workers=1, chat_rate=100,
+                        breaker=breaker).start()
+        outbox.put('1', 'text')
+        assert outbox.close(timeout=0.2) == 1
+        assert bot.sent == []
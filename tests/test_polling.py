@@ -0,0 +1,54 @@
+from polling import AdaptiveSchedule, FixedSchedule
+
+
+def make_schedule(**kwargs):
+    params = dict(
+        base_period=600, fast_period=60, max_period=3600,
+        backoff_factor=2, jitter=0
+    )
+    params.update(kwargs)
+    return AdaptiveSchedule(**params)
+
+
+class TestSchedules:
+
+    def test_fixed_schedule(self):
+        schedule = FixedSchedule(600)
+        schedule.record_error()
+        assert schedule.initial_delay() == 0
+        assert schedule.next_delay(elapsed=5) == 600
+
+    def test_fast_while_reviewing(self):
+        schedule = make_schedule()
+        schedule.record_success([{'id': 1, 'status': 'reviewing'}])
+        assert schedule.reviewing
+        assert schedule.next_delay() == 60
+        schedule.record_success([])
+        assert schedule.next_delay() == 60
+        schedule.record_success([{'id': 1, 'status': 'approved'}])
+        assert not schedule.reviewing
+        assert schedule.next_delay() == 600
+
+    def test_idle_backoff_is_capped(self):
+        schedule = make_schedule()
+        delays = []
+        for _ in range(5):
+            schedule.record_success([])
+            delays.append(schedule.next_delay())
+        assert delays == [600, 1200, 2400, 3600, 3600]
+
+    def test_error_backoff_resets_on_success(self):
+        schedule = make_schedule()
+        schedule.record_error()
+        schedule.record_error()
+        assert schedule.next_delay() == 1200
+        schedule.record_success([{'id': 1, 'status': 'reviewing'}])
+        assert schedule.next_delay() == 60
+
+    def test_elapsed_and_jitter(self):
+        schedule = make_schedule(jitter=0.1)
+        for _ in range(100):
+            delay = schedule.next_delay(elapsed=10)
+            assert 530 <= delay <= 650
+        assert make_schedule().next_delay(elapsed=10_000) == 0
+        assert 0 <= schedule.initial_delay() <= 60
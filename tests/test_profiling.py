@@ -0,0 +1,89 @@
+import signal
+import time
+
+import pytest
+
+from profiling import Profiler
+
+
+class TestProfiler:
+
+    def test_disabled_stage_returns_function_unchanged(self):
+        profiler = Profiler(enabled=False)
+
+        def func():
+            return 1
+
+        assert profiler.stage('func')(func) is func
+        with profiler.span('span'):
+            pass
+        assert profiler.timings() == []
+
+    def test_nested_stages_are_recorded_with_path(self):
+        profiler = Profiler(enabled=True)
+
+        @profiler.stage('inner')
+        def inner():
+            time.sleep(0.01)
+
+        @profiler.stage('outer')
+        def outer(value):
+            inner()
+            return value
+
+        assert outer(5) == 5
+        inner_timing, outer_timing = profiler.timings()
+        assert inner_timing.path == ('outer', 'inner')
+        assert outer_timing.path == ('outer',)
+        assert outer_timing.wall >= inner_timing.wall >= 0.01
+        assert outer_timing.self_wall < inner_timing.wall
+
+    def test_stage_is_recorded_on_exception(self):
+        profiler = Profiler(enabled=True)
+
+        @profiler.stage('failing')
+        def failing():
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            failing()
+        assert [timing.path for timing in profiler.timings()] == [
+            ('failing',)
+        ]
+
+    def test_ring_buffer_keeps_last_timings(self):
+        profiler = Profiler(enabled=True, capacity=3)
+        for index in range(5):
+            with profiler.span(f'stage{index}'):
+                pass
+        assert [timing.path for timing in profiler.timings()] == [
+            ('stage2',), ('stage3',), ('stage4',)
+        ]
+
+    def test_folded_aggregates_self_time(self):
+        profiler = Profiler(enabled=True)
+        for _ in range(2):
+            with profiler.span('cycle'):
+                with profiler.span('get_api_answer'):
+                    pass
+        lines = profiler.folded().splitlines()
+        assert [line.rsplit(' ', 1)[0] for line in lines] == [
+            'cycle', 'cycle;get_api_answer'
+        ]
+        assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+
+    @pytest.mark.skipif(
+        not hasattr(signal, 'SIGUSR1'), reason='нет SIGUSR1'
+    )
+    def test_dump_on_signal(self, tmp_path):
+        profiler = Profiler(enabled=True)
+        path = tmp_path / 'profile.folded'
+        previous = signal.getsignal(signal.SIGUSR1)
+        try:
+            profiler.install(str(path))
+            with profiler.span('send_message'):
+                pass
+            signal.raise_signal(signal.SIGUSR1)
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
+        assert path.read_text().startswith('send_message ')
@@ -0,0 +1,157 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import requests
+import utils
+
+from response_cache import ResponseCache
+from subscriptions import SubscriptionRegistry
+
+
+class FakeResponse:
+
+    def __init__(self, content=b'{}', headers=None,
+                 status_code=HTTPStatus.OK):
+        self.content = content
+        self.headers = headers or {}
+        self.status_code = status_code
+        self.reason = ''
+        self.parsed = 0
+
+    def json(self):
+        self.parsed += 1
+        return {'homeworks': [], 'current_date': 1}
+
+
+class TestResponseCache:
+
+    def test_response_without_validators_is_not_stored(self):
+        cache = ResponseCache(maxsize=8)
+        response = FakeResponse()
+        data = cache.update('token', response)
+        assert data == {'homeworks': [], 'current_date': 1}
+        assert response.parsed == 1
+        assert cache.get('token') is None
+        assert (cache.hits, cache.misses) == (0, 1)
+
+    def test_validators(self):
+        cache = ResponseCache(maxsize=8)
+        cache.update('token', FakeResponse(headers={
+            'ETag': '"abc"', 'Last-Modified': 'yesterday'
+        }))
+        assert cache.get('token').validators() == {
+            'If-None-Match': '"abc"', 'If-Modified-Since': 'yesterday'
+        }
+        assert cache.get('other') is None
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(maxsize=2)
+        for token in ('first', 'second', 'third'):
+            cache.update(token, FakeResponse(headers={'ETag': '"v1"'}))
+        assert len(cache) == 2
+        assert cache.get('first') is None
+
+    def test_not_modified_uses_cache(self, monkeypatch, homework_module):
+        monkeypatch.setattr(
+            homework_module, 'response_cache', ResponseCache(maxsize=8)
+        )
+        responses = [
+            FakeResponse(headers={'ETag': '"v1"'}),
+            FakeResponse(content=b'', status_code=HTTPStatus.NOT_MODIFIED),
+        ]
+        sent_headers = []
+
+        def mock_get(url, headers=None, **kwargs):
+            sent_headers.append(headers)
+            return responses.pop(0)
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        headers = {'Authorization': 'OAuth token'}
+        data = homework_module.request_homework_statuses(0, headers)
+        cached = homework_module.request_homework_statuses(
+            data['current_date'], headers
+        )
+        assert cached is data
+        assert sent_headers[1]['If-None-Match'] == '"v1"'
+        assert homework_module.response_cache.hits == 1
+
+
+class StatusesResponse(FakeResponse):
+
+    def __init__(self, data):
+        super().__init__(content=json.dumps(data).encode())
+        self.data = data
+
+    def json(self):
+        self.parsed += 1
+        return self.data
+
+
+def poll(homework_module, bot, registry):
+    async def run():
+        semaphore = asyncio.Semaphore(1)
+        await asyncio.gather(*(
+            homework_module.async_poll_subscription(
+                bot, subscription, semaphore
+            )
+            for subscription in registry.snapshot()
+        ))
+    asyncio.run(run())
+
+
+class SentMessages(utils.MockTelegramBot):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.sent = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        self.sent.append((chat_id, text))
+
+
+class TestCachedResponseIsStillProcessed:
+
+    def test_every_chat_of_token_is_notified(self, monkeypatch,
+                                             homework_module):
+        monkeypatch.setattr(
+            homework_module, 'response_cache', ResponseCache(maxsize=8)
+        )
+        data = {
+            'homeworks': [{'homework_name': 'hw1', 'status': 'approved'}],
+            'current_date': 1,
+        }
+        monkeypatch.setattr(
+            requests, 'get', lambda *args, **kwargs: StatusesResponse(data)
+        )
+        registry = SubscriptionRegistry()
+        registry.add('token', 1, timestamp=0)
+        registry.add('token', 2, timestamp=0)
+        bot = SentMessages()
+        poll(homework_module, bot, registry)
+        assert sorted(chat_id for chat_id, _ in bot.sent) == ['1', '2']
+
+    def test_bad_homework_does_not_block_the_rest(self, monkeypatch,
+                                                  homework_module, caplog):
+        monkeypatch.setattr(
+            homework_module, 'response_cache', ResponseCache(maxsize=8)
+        )
+        data = {
+            'homeworks': [
+                {'id': 1, 'homework_name': 'hw1', 'status': 'approved'},
+                {'id': 2, 'homework_name': 'hw2', 'status': 'unknown'},
+            ],
+            'current_date': 5,
+        }
+        monkeypatch.setattr(
+            requests, 'get', lambda *args, **kwargs: StatusesResponse(data)
+        )
+        registry = SubscriptionRegistry()
+        subscription = registry.add('token', 1, timestamp=0)
+        bot = SentMessages()
+        poll(homework_module, bot, registry)
+        poll(homework_module, bot, registry)
+        assert subscription.timestamp == 5
+        assert len(bot.sent) == 1
+        assert '"hw1"' in bot.sent[0][1]
+        assert 'Работа 2 пропущена' in caplog.text
@@ -0,0 +1,92 @@
+import time
+from http import HTTPStatus
+
+import pytest
+import requests
+
+from retry import RetryPolicy, retry_after_seconds
+
+
+class Response:
+
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def sequence(*outcomes):
+    outcomes = list(outcomes)
+    calls = []
+
+    def request(*args, **kwargs):
+        calls.append(kwargs)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    request.calls = calls
+    return request
+
+
+class TestRetryPolicy:
+
+    def test_transient_failures_are_absorbed(self):
+        policy = RetryPolicy(attempts=3, base_delay=0.01)
+        failed = Response(HTTPStatus.BAD_GATEWAY)
+        request = sequence(
+            requests.ConnectionError('reset'),
+            failed,
+            Response(HTTPStatus.OK),
+        )
+        response = policy.get(request, 'url', timeout=1)
+        assert response.status_code == HTTPStatus.OK
+        assert len(request.calls) == 3
+        assert request.calls[0] == {'timeout': 1}
+        assert failed.closed
+
+    def test_gives_up_after_attempts(self):
+        policy = RetryPolicy(attempts=2, base_delay=0.01)
+        request = sequence(
+            requests.ConnectionError('first'),
+            requests.ConnectionError('second'),
+        )
+        with pytest.raises(requests.ConnectionError, match='second'):
+            policy.get(request)
+        response = policy.get(sequence(
+            Response(HTTPStatus.SERVICE_UNAVAILABLE),
+            Response(HTTPStatus.SERVICE_UNAVAILABLE),
+        ))
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+
+    @pytest.mark.parametrize('outcome', [
+        Response(HTTPStatus.UNAUTHORIZED),
+        requests.RequestException('not a connection error'),
+        requests.ReadTimeout('read timeout'),
+    ])
+    def test_unsafe_failures_are_not_retried(self, outcome):
+        request = sequence(outcome, Response(HTTPStatus.OK))
+        try:
+            RetryPolicy(base_delay=0.01).get(request)
+        except requests.RequestException:
+            pass
+        assert len(request.calls) == 1
+
+    def test_retry_after_and_budget(self):
+        policy = RetryPolicy(attempts=3, base_delay=0.01, budget=0.5)
+        started = time.monotonic()
+        response = policy.get(sequence(
+            Response(HTTPStatus.TOO_MANY_REQUESTS, {'Retry-After': '0.1'}),
+            Response(HTTPStatus.TOO_MANY_REQUESTS, {'Retry-After': '60'}),
+        ))
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        assert 0.1 <= time.monotonic() - started < 0.5
+
+    def test_retry_after_seconds(self):
+        assert retry_after_seconds(Response(200, {'Retry-After': '3'})) == 3
+        assert retry_after_seconds(Response(200, {'Retry-After': 'x'})) is None
+        assert retry_after_seconds(object()) is None
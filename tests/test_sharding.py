@@ -0,0 +1,140 @@
+import asyncio
+import json
+
+import pytest
+
+from sharding import HashRing, dyno_shard_index
+
+TOKENS = [f'token-{number}' for number in range(2000)]
+
+
+class TestHashRing:
+
+    def test_single_shard_owns_everything(self):
+        ring = HashRing(1)
+        assert all(ring.owns(0, token) for token in TOKENS)
+
+    def test_tokens_are_spread_evenly(self):
+        ring = HashRing(4)
+        counts = [0] * 4
+        for token in TOKENS:
+            counts[ring.shard_for(token)] += 1
+        assert min(counts) > len(TOKENS) / 4 * 0.7
+
+    def test_adding_a_shard_moves_few_tokens(self):
+        before, after = HashRing(4), HashRing(5)
+        moved = sum(
+            before.shard_for(token) != after.shard_for(token)
+            for token in TOKENS
+        )
+        assert moved < len(TOKENS) * 0.3
+        assert all(
+            after.shard_for(token) == 4
+            for token in TOKENS
+            if before.shard_for(token) != after.shard_for(token)
+        )
+
+    def test_invalid_shard_count(self):
+        with pytest.raises(ValueError):
+            HashRing(0)
+
+    @pytest.mark.parametrize('dyno, shard', [
+        ('worker.1', 0), ('worker.3', 2), ('web', None), (None, None),
+    ])
+    def test_dyno_shard_index(self, dyno, shard):
+        assert dyno_shard_index(dyno) == shard
+
+
+class TestShardedRegistry:
+
+    def test_shard_polls_own_tokens(self, monkeypatch, tmp_path,
+                                       homework_module):
+        path = tmp_path / 'subscriptions.json'
+        path.write_text(json.dumps([
+            {'token': token, 'chat_id': 1} for token in TOKENS[:100]
+        ]))
+        ring = HashRing(3)
+        monkeypatch.setattr(homework_module, 'SUBSCRIPTIONS_FILE', str(path))
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', None)
+        monkeypatch.setattr(homework_module, 'SHARD_COUNT', 3)
+        monkeypatch.setattr(homework_module, 'hash_ring', ring)
+        tokens = set()
+        for shard in range(3):
+            monkeypatch.setattr(homework_module, 'SHARD_INDEX', str(shard))
+            registry = homework_module.load_registry()
+            assert len(registry) == 100
+            owned = {
+                subscription.token for subscription
+                in homework_module.owned_subscriptions(registry)
+            }
+            assert all(ring.shard_for(token) == shard for token in owned)
+            tokens.update(owned)
+        assert tokens == set(TOKENS[:100])
+
+    def test_commands_cover_tokens_of_other_shards(
+            self, monkeypatch, tmp_path, fresh_state, homework_module):
+        ring = HashRing(2)
+        remote = [token for token in TOKENS if ring.shard_for(token) == 1]
+        path = tmp_path / 'subscriptions.json'
+        path.write_text(json.dumps([{'token': remote[0], 'chat_id': 1}]))
+        monkeypatch.setattr(homework_module, 'SUBSCRIPTIONS_FILE', str(path))
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', None)
+        monkeypatch.setattr(homework_module, 'SHARD_COUNT', 2)
+        monkeypatch.setattr(homework_module, 'hash_ring', ring)
+        monkeypatch.setattr(homework_module, 'SHARD_INDEX', '1')
+        owner = homework_module.load_registry()
+        monkeypatch.setattr(homework_module, 'SHARD_INDEX', '0')
+        handler = homework_module.make_command_handler(
+            None, homework_module.load_registry(), None
+        )
+        fresh_state.set_status(
+            homework_module.subscription_key(remote[0], 1), 7, 'approved'
+        )
+
+        async def handle_commands():
+            assert 'Работа проверена' in handler.handle(1, '/status')
+            assert 'приостановлены' in handler.handle(1, '/pause')
+            assert 'подписан' in handler.handle(
+                2, f'/subscribe {remote[1]}'
+            )
+            await asyncio.gather(*homework_module.subscription_saves)
+
+        asyncio.run(handle_commands())
+
+        monkeypatch.setattr(homework_module, 'SHARD_INDEX', '1')
+        added = homework_module.sync_registry(owner)
+        assert [subscription.token for subscription in added] == [remote[1]]
+        assert owner.get(remote[0], 1).paused
+        assert not owner.get(remote[1], 2).paused
+
+    def test_dyno_is_ignored_by_default(self, monkeypatch, homework_module):
+        monkeypatch.setattr(homework_module, 'SHARD_COUNT', 4)
+        monkeypatch.setattr(homework_module, 'SHARD_INDEX', None)
+        monkeypatch.setattr(homework_module, 'DYNO', 'worker.1')
+        assert homework_module.current_shard() is None
+
+    @pytest.mark.parametrize('dyno, shard', [
+        ('worker.1', 0), ('worker.4', 3),
+    ])
+    def test_shard_from_dyno(self, monkeypatch, homework_module,
+                             dyno, shard):
+        monkeypatch.setattr(homework_module, 'SHARD_COUNT', 4)
+        monkeypatch.setattr(homework_module, 'SHARD_INDEX', None)
+        monkeypatch.setattr(homework_module, 'SHARD_FROM_DYNO', True)
+        monkeypatch.setattr(homework_module, 'DYNO', dyno)
+        assert homework_module.current_shard() == shard
+
+    @pytest.mark.parametrize('dyno', ['worker.5', 'web', None])
+    def test_bad_dyno_fails(self, monkeypatch, homework_module, dyno):
+        monkeypatch.setattr(homework_module, 'SHARD_COUNT', 4)
+        monkeypatch.setattr(homework_module, 'SHARD_INDEX', None)
+        monkeypatch.setattr(homework_module, 'SHARD_FROM_DYNO', True)
+        monkeypatch.setattr(homework_module, 'DYNO', dyno)
+        with pytest.raises(SystemExit):
+            homework_module.current_shard()
+
+    def test_shard_out_of_range(self, monkeypatch, homework_module):
+        monkeypatch.setattr(homework_module, 'SHARD_COUNT', 2)
+        monkeypatch.setattr(homework_module, 'SHARD_INDEX', '2')
+        with pytest.raises(SystemExit):
+            homework_module.current_shard()
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import requests
+import utils
+
+from singleflight import SingleFlight
+from subscriptions import SubscriptionRegistry
+
+
+def run_concurrently(func, count):
+    results, errors = [], []
+
+    def target():
+        try:
+            results.append(func())
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+class TestSingleFlight:
+
+    def test_concurrent_calls_are_coalesced(self):
+        flight = SingleFlight('test')
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'value': 1}
+
+        results, _ = run_concurrently(lambda: flight.do('key', slow), 5)
+        assert len(calls) == 1
+        assert len(results) == 5
+        assert all(result is results[0] for result in results)
+        assert flight.in_flight() == 0
+
+    def test_errors_are_shared(self):
+        flight = SingleFlight('test')
+
+        def failing():
+            time.sleep(0.1)
+            raise ValueError('boom')
+
+        _, errors = run_concurrently(lambda: flight.do('key', failing), 3)
+        assert len(errors) == 3
+        assert all(isinstance(error, ValueError) for error in errors)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        flight = SingleFlight('test')
+        calls = []
+        for _ in range(2):
+            flight.do('key', calls.append, 1)
+        assert len(calls) == 2
+        with pytest.raises(ZeroDivisionError):
+            flight.do('key', lambda: 1 / 0)
+
+
+class TestCoalescedPolls:
+
+    def test_one_request_per_token(self, monkeypatch, homework_module,
+                                   data_with_new_hw_status):
+        calls = []
+
+        def get(*args, **kwargs):
+            calls.append(1)
+            time.sleep(0.1)
+            return utils.MockResponseGET(
+                *args, data=data_with_new_hw_status, **kwargs
+            )
+
+        monkeypatch.setattr(requests, 'get', get)
+        sent = []
+
+        class Bot(utils.MockTelegramBot):
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                sent.append(chat_id)
+
+        registry = SubscriptionRegistry()
+        for chat_id in range(3):
+            registry.add('token', chat_id, timestamp=0)
+
+        async def poll():
+            bot, semaphore = Bot(), asyncio.Semaphore(3)
+            await asyncio.gather(*(
+                homework_module.async_poll_subscription(
+                    bot, subscription, semaphore
+                )
+                for subscription in registry.snapshot()
+            ))
+
+        asyncio.run(poll())
+        assert len(calls) == 1
+        assert sorted(sent) == ['0', '1', '2']
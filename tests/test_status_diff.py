@@ -0,0 +1,58 @@
+from models import Homework
+from status_diff import StatusDiff
+from storage import StateStore
+
+
+def homework(status, date_updated, homework_id=1):
+    return {
+        'id': homework_id, 'homework_name': f'hw{homework_id}',
+        'status': status, 'date_updated': date_updated,
+    }
+
+
+class TestStatusDiff:
+
+    def test_repeated_status_is_not_a_change(self):
+        diff = StatusDiff()
+        first = [homework('reviewing', '2020-02-13T10:00:00Z')]
+        assert diff.changes('chat', first) == first
+        diff.record('chat', first)
+        assert diff.changes('chat', first) == []
+        assert diff.changes('other', first) == first
+
+    def test_transitions_in_one_response(self):
+        diff = StatusDiff()
+        homeworks = [
+            homework('approved', '2020-02-14T10:00:00Z'),
+            homework('reviewing', '2020-02-13T10:00:00Z'),
+            homework('reviewing', '2020-02-13T10:00:00Z'),
+        ]
+        changed = diff.changes('chat', homeworks)
+        assert [hw['status'] for hw in changed] == ['reviewing', 'approved']
+
+    def test_same_status_with_newer_date_is_a_change(self):
+        diff = StatusDiff()
+        diff.record('chat', [homework('rejected', '2020-02-13T10:00:00Z')])
+        assert diff.changes(
+            'chat', [homework('rejected', '2020-02-15T10:00:00Z')]
+        )
+        assert not diff.changes(
+            'chat', [homework('rejected', '2020-02-12T10:00:00Z')]
+        )
+
+    def test_falls_back_to_store(self):
+        store = StateStore()
+        store.set_status('chat', 1, 'approved')
+        diff = StatusDiff(store)
+        assert not diff.changes(
+            'chat', [Homework.from_dict(homework('approved', None))]
+        )
+        diff.record('chat', [homework('rejected', None, homework_id=2)])
+        assert store.get_status('chat', 2) == 'rejected'
+        assert len(diff) == 1
+
+    def test_main_does_not_repeat_notifications(self, homework_module):
+        homeworks = [homework('approved', '2020-02-13T10:00:00Z')]
+        assert homework_module.new_statuses('chat', homeworks) == homeworks
+        homework_module.remember_statuses('chat', homeworks)
+        assert homework_module.new_statuses('chat', homeworks) == []
@@ -0,0 +1,91 @@
+import importlib
+
+import pytest
+
+from storage import (
+    STATE_BACKENDS, JsonStateStore, SQLiteStateStore, StateStore,
+    open_state_store,
+)
+
+
+@pytest.fixture(params=['sqlite', 'json'])
+def store_path(request, tmp_path):
+    return request.param, str(tmp_path / f'state.{request.param}')
+
+
+class TestStateStore:
+
+    def test_memory_store(self):
+        store = open_state_store('sqlite', None)
+        assert type(store) is StateStore
+        store.set_timestamp('key', 10)
+        store.set_status('key', 1, 'approved')
+        store.close()
+        assert store.get_timestamp('key') == 10
+        assert store.get_status('key', '1') == 'approved'
+
+    @pytest.mark.parametrize('backend, path', [
+        ('sqlite', 'homework_bot.sqlite3'),
+        ('json', 'homework_bot.json'),
+    ])
+    def test_file_store_by_default(self, monkeypatch, backend, path):
+        import config
+        monkeypatch.delenv('STATE_PATH', raising=False)
+        monkeypatch.setenv('STATE_BACKEND', backend)
+        try:
+            assert importlib.reload(config).STATE_PATH == path
+        finally:
+            monkeypatch.undo()
+            importlib.reload(config)
+
+    def test_unknown_backend(self, tmp_path):
+        with pytest.raises(ValueError):
+            open_state_store('redis', str(tmp_path / 'state'))
+
+    def test_state_survives_restart(self, store_path):
+        backend, path = store_path
+        store = open_state_store(backend, path)
+        assert isinstance(store, (SQLiteStateStore, JsonStateStore))
+        store.set_timestamp('key', 10)
+        store.set_error('key', 'Сбой')
+        store.set_status('key', 1, 'reviewing')
+        store.set_status('key', 1, 'approved')
+        store.close()
+
+        restored = open_state_store(backend, path)
+        assert restored.get_timestamp('key') == 10
+        assert restored.get_error('key') == 'Сбой'
+        assert restored.get_status('key', 1) == 'approved'
+        assert restored.get_timestamp('other', 5) == 5
+        restored.close()
+
+    def test_writes_are_batched(self, store_path):
+        backend, path = store_path
+        writes = []
+
+        class CountingStore(STATE_BACKENDS[backend]):
+            def _write(self, subscriptions, statuses):
+                writes.append((len(subscriptions), len(statuses)))
+                super()._write(subscriptions, statuses)
+
+        store = CountingStore(path, flush_interval=60)
+        for timestamp in range(100):
+            store.set_timestamp('key', timestamp)
+            store.set_status('key', timestamp % 3, 'reviewing')
+        assert writes == []
+        store.flush()
+        store.flush()
+        store.close()
+        assert writes == [(1, 3)]
+
+    def test_sqlite_statuses_of_other_processes(self, tmp_path):
+        path = str(tmp_path / 'state.sqlite3')
+        reader = SQLiteStateStore(path)
+        writer = SQLiteStateStore(path)
+        writer.set_status('key', 1, 'approved')
+        writer.close()
+        reader.set_status('key', 2, 'reviewing')
+        assert sorted(reader.get_statuses('key')) == [
+            ('1', 'approved'), ('2', 'reviewing'),
+        ]
+        reader.close()
@@ -0,0 +1,131 @@
+import json
+from http import HTTPStatus
+
+import pytest
+import requests
+import utils
+
+from streaming import StreamingStatusParser, iter_homeworks
+
+BODY = json.dumps({
+    'homeworks': [
+        {'id': 1, 'homework_name': 'Домашка 1', 'status': 'approved'},
+        {'id': 2, 'homework_name': 'hw2', 'status': 'reviewing'},
+        {'id': 1, 'homework_name': 'Домашка 1', 'status': 'approved'},
+    ],
+    'current_date': 1581604970,
+}, ensure_ascii=False).encode()
+
+
+def chunked(body, size):
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+
+class StreamResponse:
+
+    def __init__(self, body, status_code=HTTPStatus.OK):
+        self.body = body
+        self.status_code = status_code
+        self.reason = 'reason'
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        return iter(chunked(self.body, 7))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.closed = True
+
+
+class TestStreamingStatusParser:
+
+    @pytest.mark.parametrize('size', [1, 3, 16, len(BODY)])
+    def test_chunks_of_any_size(self, size):
+        parser = StreamingStatusParser()
+        homeworks = list(iter_homeworks(chunked(BODY, size), parser))
+        assert [homework['id'] for homework in homeworks] == [1, 2, 1]
+        assert homeworks[0]['homework_name'] == 'Домашка 1'
+        assert parser.current_date == 1581604970
+
+    def test_homeworks_are_yielded_before_the_end(self):
+        parser = StreamingStatusParser()
+        end = BODY.index(b'}, {') + 3
+        assert parser.feed(BODY[:end])[0]['id'] == 1
+
+    @pytest.mark.parametrize('body, error', [
+        (b'[]', TypeError),
+        (b'{"homeworks": {}, "current_date": 1}', TypeError),
+        (b'{"homeworks": [1], "current_date": 1}', TypeError),
+        (b'{"homeworks": []}', KeyError),
+        (b'{"current_date": 1}', KeyError),
+        (b'{"homeworks": [{"id": 1}', ValueError),
+        (b'{"homeworks": [], "current_date": 1', ValueError),
+    ])
+    def test_invalid_responses(self, body, error):
+        with pytest.raises(error):
+            list(iter_homeworks(chunked(body, 4)))
+
+
+class TestNotifyFromStream:
+
+    def test_sends_each_homework_once(self, monkeypatch, homework_module):
+        response = StreamResponse(BODY)
+        monkeypatch.setattr(
+            requests, 'get', lambda *args, **kwargs: response
+        )
+        sent = []
+
+        class Bot(utils.MockTelegramBot):
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                sent.append((chat_id, text))
+
+        current_date, homeworks = homework_module.notify_from_stream(
+            Bot(), 42, 'stream', 0, {'Authorization': 'OAuth token'}
+        )
+        assert current_date == 1581604970
+        assert [(homework.id, homework.status) for homework in homeworks] == [
+            (1, 'approved'), (2, 'reviewing'),
+        ]
+        assert len(sent) == 2
+        assert sent[0][0] == 42 and 'Домашка 1' in sent[0][1]
+        assert response.closed
+
+    def test_broken_stream_does_not_resend(self, monkeypatch,
+                                           homework_module):
+        broken = BODY[:BODY.index(b'"current_date"')]
+        bodies = [broken, BODY]
+        monkeypatch.setattr(
+            requests, 'get',
+            lambda *args, **kwargs: StreamResponse(bodies.pop(0))
+        )
+        sent = []
+
+        class Bot(utils.MockTelegramBot):
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                sent.append(text)
+
+        with pytest.raises(ValueError):
+            homework_module.notify_from_stream(
+                Bot(), 42, 'stream', 0, {'Authorization': 'OAuth token'}
+            )
+        assert len(sent) == 2
+        _, homeworks = homework_module.notify_from_stream(
+            Bot(), 42, 'stream', 0, {'Authorization': 'OAuth token'}
+        )
+        assert homeworks == []
+        assert len(sent) == 2
+
+    def test_bad_status_code(self, monkeypatch, homework_module):
+        monkeypatch.setattr(
+            requests, 'get',
+            lambda *args, **kwargs: StreamResponse(
+                b'', HTTPStatus.INTERNAL_SERVER_ERROR
+            )
+        )
+        with pytest.raises(ValueError):
+            homework_module.notify_from_stream(
+                utils.MockTelegramBot(), 42, 'stream', 0,
+                {'Authorization': 'OAuth'}
+            )
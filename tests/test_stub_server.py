@@ -0,0 +1,41 @@
+import requests
+
+from benchmarks.stub_server import StubServer, StubState
+
+
+class TestStubServer:
+
+    def test_practicum_endpoint(self):
+        with StubServer(StubState(change_rate=1, homeworks=3)) as server:
+            response = requests.get(
+                server.endpoint,
+                headers={'Authorization': 'OAuth token'},
+                params={'from_date': 0},
+                timeout=1,
+            )
+            unauthorized = requests.get(
+                server.endpoint, params={'from_date': 0}, timeout=1
+            )
+        assert response.status_code == 200
+        assert len(response.json()['homeworks']) == 3
+        assert unauthorized.status_code == 401
+
+    def test_errors_and_telegram(self, monkeypatch, homework_module):
+        with StubServer(StubState(error_rate=1)) as server:
+            monkeypatch.setattr(homework_module, 'ENDPOINT', server.endpoint)
+            try:
+                homework_module.get_api_answer(0)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError('Ожидалась ошибка 500.')
+            response = requests.post(
+                f'{server.telegram_url}123:abc/sendMessage',
+                json={'chat_id': 1, 'text': 'Работа "hw-1" проверена'},
+                timeout=1,
+            )
+        assert response.json()['ok']
+        assert server.state.errors == (
+            homework_module.api_retry_policy.attempts
+        )
+        assert server.state.messages == 1
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from subscriptions import SubscriptionRegistry
+
+
+class TestSubscriptionRegistry:
+
+    def test_add_is_idempotent(self):
+        registry = SubscriptionRegistry()
+        first = registry.add('token', 1, timestamp=10)
+        second = registry.add('token', '1', timestamp=20)
+        assert first is second
+        assert first.timestamp == 10
+        assert len(registry) == 1
+
+    def test_token_with_several_chats(self):
+        registry = SubscriptionRegistry()
+        registry.add('token', 1)
+        registry.add('token', 2)
+        registry.add('other', 1)
+        assert sorted(registry.tokens()) == ['other', 'token']
+        assert len(registry) == 3
+        registry.remove('token', 1)
+        registry.remove('token', 2)
+        assert registry.tokens() == ['other']
+
+    def test_headers_built_once(self):
+        subscription = SubscriptionRegistry().add('token', 1)
+        assert subscription.headers == {'Authorization': 'OAuth token'}
+
+    def test_from_file(self, tmp_path):
+        path = tmp_path / 'subscriptions.json'
+        path.write_text(json.dumps([
+            {'token': 'a', 'chat_id': 1},
+            {'token': 'b', 'chat_id': '2'},
+        ]))
+        registry = SubscriptionRegistry.from_file(str(path), timestamp=0)
+        assert registry.get('a', '1').timestamp == 0
+        assert registry.get('b', 2) is not None
+
+    def test_from_file_without_chat_id(self, tmp_path):
+        path = tmp_path / 'subscriptions.json'
+        path.write_text(json.dumps([{'token': 'a'}]))
+        with pytest.raises(KeyError):
+            SubscriptionRegistry.from_file(str(path))
+
+    def test_for_chat_and_to_file(self, tmp_path):
+        registry = SubscriptionRegistry()
+        registry.add('token-1', 10)
+        registry.add('token-2', 10)
+        registry.add('token-2', 20)
+        assert sorted(
+            sub.token for sub in registry.for_chat(10)
+        ) == ['token-1', 'token-2']
+        path = tmp_path / 'subscriptions.json'
+        registry.to_file(path)
+        restored = SubscriptionRegistry.from_file(path)
+        assert len(restored) == 3
+        assert restored.get('token-2', 20) is not None
+
+    def test_paused_survives_file(self, tmp_path):
+        registry = SubscriptionRegistry()
+        registry.add('token-1', 10).paused = True
+        registry.add('token-2', 10)
+        path = tmp_path / 'subscriptions.json'
+        registry.to_file(path)
+        restored = SubscriptionRegistry.from_file(path)
+        assert restored.get('token-1', 10).paused
+        assert not restored.get('token-2', 10).paused
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from templates import MessageTemplates
+
+VERDICTS = {
+    'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
+    'reviewing': 'Работа взята на проверку ревьюером.',
+}
+
+
+@pytest.fixture
+def templates():
+    registry = MessageTemplates()
+    registry.add_locale('ru', VERDICTS)
+    return registry
+
+
+class TestMessageTemplates:
+
+    def test_default_message(self, templates):
+        text = templates.render(
+            {'homework_name': 'hw', 'status': 'approved'}
+        )
+        assert text == (
+            'Изменился статус проверки работы "hw". ' + VERDICTS['approved']
+        )
+
+    def test_unknown_status(self, templates):
+        with pytest.raises(KeyError, match='unknown'):
+            templates.render({'homework_name': 'hw', 'status': 'unknown'})
+
+    def test_verdict_with_braces(self, templates):
+        templates.add_locale('ru', {'odd': 'Статус {странный}'})
+        assert templates.render(
+            {'homework_name': 'hw', 'status': 'odd'}
+        ).endswith('Статус {странный}')
+
+    def test_load_locale_and_optional_fields(self, templates, tmp_path):
+        path = tmp_path / 'templates.json'
+        path.write_text(json.dumps({
+            'en': {
+                'message': '{lesson_name}: "{homework_name}" - {verdict}',
+                'verdicts': {'approved': 'approved!'},
+                'optional': {'reviewer_comment': ' ({reviewer_comment})'},
+            },
+            'ru': {'verdicts': {'on_hold': 'Работа отложена.'}},
+        }), encoding='utf-8')
+        templates.load(str(path))
+        homework = {
+            'homework_name': 'hw', 'status': 'approved',
+            'lesson_name': 'Final', 'reviewer_comment': 'nice',
+        }
+        assert templates.render(homework, 'en') == (
+            'Final: "hw" - approved! (nice)'
+        )
+        del homework['reviewer_comment']
+        assert templates.render(homework, 'en') == 'Final: "hw" - approved!'
+        homework['status'] = 'reviewing'
+        assert templates.render(homework, 'en').endswith(
+            VERDICTS['reviewing']
+        )
+        assert 'on_hold' in templates.statuses()
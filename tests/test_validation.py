@@ -0,0 +1,56 @@
+import pytest
+
+from models import StatusResponse
+from validation import status_response_defects, validate_status_response
+
+
+def homework(index, **fields):
+    data = {
+        'id': index,
+        'homework_name': f'hw{index}',
+        'status': 'approved',
+    }
+    data.update(fields)
+    return data
+
+
+class TestValidateStatusResponse:
+
+    def test_valid_response_is_returned(self):
+        data = {'current_date': 1, 'homeworks': [homework(1), homework(2)]}
+        assert validate_status_response(data) is data
+        assert status_response_defects(data) == []
+
+    def test_all_defects_are_reported(self):
+        broken = [homework(index) for index in range(5)]
+        del broken[1]['status']
+        del broken[3]['homework_name']
+        broken[4]['status'] = None
+        broken.append('hw')
+        with pytest.raises(TypeError) as error:
+            validate_status_response({'current_date': 1, 'homeworks': broken})
+        assert [str(defect) for defect in error.value.defects] == [
+            'response.homeworks[1]: нет ключа \'status\'.',
+            'response.homeworks[3]: нет ключа \'homework_name\'.',
+            'response.homeworks[4].status: ожидался str, пришёл NoneType.',
+            'response.homeworks[5]: ожидался dict, пришёл str.',
+        ]
+        assert 'response.homeworks[3]' in str(error.value)
+
+    def test_only_missing_keys_raise_key_error(self):
+        data = {'homeworks': [homework(1), {'status': 'x'}]}
+        del data['homeworks'][0]['status']
+        with pytest.raises(KeyError) as error:
+            StatusResponse.from_dict(data)
+        assert [defect.path for defect in error.value.defects] == [
+            'response', 'response.homeworks[0]', 'response.homeworks[1]',
+        ]
+
+    @pytest.mark.parametrize('data, path', [
+        ([], 'response'),
+        ({'current_date': 1, 'homeworks': {}}, 'response.homeworks'),
+    ])
+    def test_wrong_container_types(self, data, path):
+        defects = status_response_defects(data)
+        assert [defect.path for defect in defects] == [path]
+        assert not defects[0].missing
@@ -0,0 +1,105 @@
+RESPONSE_KEYS = ('current_date', 'homeworks')
+
+HOMEWORK_FIELDS = (('homework_name', str), ('status', str))
+
+
+class Defect:
+    """Одна проблема в проверяемом ответе."""
+
+    __slots__ = ('path', 'message', 'missing')
+
+    def __init__(self, path, message, missing=False):
+        """Проблема message по пути path."""
+        self.path = path
+        self.message = message
+        self.missing = missing
+
+    def __str__(self):
+        """Путь и текст проблемы."""
+        return f'{self.path}: {self.message}'
+
+    def __repr__(self):
+        """Представление проблемы."""
+        return f'Defect({str(self)!r})'
+
+
+def format_defects(defects):
+    """Текст ошибки со всеми проблемами ответа."""
+    return 'Ответ не прошёл проверку: ' + '; '.join(
+        str(defect) for defect in defects
+    )
+
+
+def _type_defect(path, expected, value):
+    return Defect(
+        path,
+        f'ожидался {expected.__name__}, пришёл {type(value).__name__}.'
+    )
+
+
+def _missing_defect(path, name):
+    return Defect(path, f'нет ключа \'{name}\'.', missing=True)
+
+
+def _homework_defects(homework, path):
+    """Все проблемы одной работы."""
+    if not isinstance(homework, dict):
+        return [_type_defect(path, dict, homework)]
+    defects = []
+    for name, expected in HOMEWORK_FIELDS:
+        if name not in homework:
+            defects.append(_missing_defect(path, name))
+        elif not isinstance(homework[name], expected):
+            defects.append(
+                _type_defect(f'{path}.{name}', expected, homework[name])
+            )
+    return defects
+
+
+def status_response_defects(data, root='response'):
+    """
+    Все проблемы ответа homework_statuses за один проход.
+    Корректная работа проверяется одним выражением без сбора
+    проблем, подробный разбор идёт только для некорректных.
+    """
+    if not isinstance(data, dict):
+        return [_type_defect(root, dict, data)]
+    defects = [
+        _missing_defect(root, name)
+        for name in RESPONSE_KEYS if name not in data
+    ]
+    homeworks = data.get('homeworks', [])
+    if not isinstance(homeworks, list):
+        defects.append(
+            _type_defect(f'{root}.homeworks', list, homeworks)
+        )
+        return defects
+    for index, homework in enumerate(homeworks):
+        if (
+            isinstance(homework, dict)
+            and isinstance(homework.get('homework_name'), str)
+            and isinstance(homework.get('status'), str)
+        ):
+            continue
+        defects.extend(
+            _homework_defects(homework, f'{root}.homeworks[{index}]')
+        )
+    return defects
+
+
+def validate_status_response(data):
+    """
+    Проверяет ответ homework_statuses и возвращает его без изменений.
+    Если есть значения не того типа, вызывает TypeError, иначе при
+    отсутствующих ключах - KeyError. Текст ошибки перечисляет все
+    проблемы, сами проблемы лежат в её атрибуте defects.
+    """
+    defects = status_response_defects(data)
+    if not defects:
+        return data
+    if all(defect.missing for defect in defects):
+        error = KeyError(format_defects(defects))
+    else:
+        error = TypeError(format_defects(defects))
+    error.defects = defects
+    raise error